@@ -5,6 +5,11 @@ class Animator:
         Enhanced animator for prompt-compliant sprite sheets
         """
         self.frames = sprite_data['frames']
+        # Mirrored frames made once up front instead of flipping every draw
+        self.flipped_frames = sprite_data.get('flipped_frames') or {
+            name: [pygame.transform.flip(frame, True, False) for frame in frames]
+            for name, frames in self.frames.items()
+        }
         self.metadata = sprite_data['metadata']
         self.current_anim = default_anim
         self.frame_index = 0
@@ -38,8 +43,8 @@ class Animator:
 
     def get_current_frame(self):
         """Get frame with optional horizontal flip"""
-        frame = self.frames[self.current_anim][self.frame_index]
-        return pygame.transform.flip(frame, self.flipped, False)
+        frames = self.flipped_frames if self.flipped else self.frames
+        return frames[self.current_anim][self.frame_index]
 
     def get_anchor_offset(self):
         """Get drawing offset for center-bottom anchor"""
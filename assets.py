@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pygame
+from utils.settings import ASSET_CACHE_DIR
+
+def _convert(surface):
+    # convert_alpha needs a display mode; headless loads keep the raw format
+    return surface.convert_alpha() if pygame.display.get_surface() else surface
+
+def _slice(surface, columns, rows):
+    """Rows of subsurfaces of a columns x rows grid sheet"""
+    width = surface.get_width() // columns
+    height = surface.get_height() // rows
+    return [
+        [surface.subsurface(pygame.Rect(col * width, row * height, width, height))
+         for col in range(columns)]
+        for row in range(rows)
+    ]
+
+class AssetManager:
+    """
+    Loads sprite sheets once. Decoded sheets are cached by (path, mtime) so
+    an edited file is picked up again, frames are scaled (and flipped) at
+    load time instead of per draw, and scaled sheets can be kept on disk in
+    ASSET_CACHE_DIR so the next start skips decoding the full-size PNG.
+    """
+    def __init__(self, cache_dir=ASSET_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.sheets = {}  # path -> (mtime, Surface)
+        self.frame_sets = {}  # (path, mtime, columns, rows, size, flipped) -> rows of frames
+
+    def clear(self):
+        """Forget every decoded sheet and frame set (the disk cache stays)"""
+        self.sheets.clear()
+        self.frame_sets.clear()
+
+    def sheet(self, path):
+        """Decoded sheet at `path`, reloaded only when the file changes"""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Sprite sheet not found: {path}")
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.sheets.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        surface = _convert(pygame.image.load(path))
+        self.sheets[path] = (mtime, surface)
+        return surface
+
+    def frames(self, path, columns=4, rows=4, resize_to=None, flipped=False):
+        """Rows of frames of a grid sheet, scaled to resize_to and optionally mirrored"""
+        mtime = os.stat(path).st_mtime_ns
+        key = (path, mtime, columns, rows, resize_to, flipped)
+        frames = self.frame_sets.get(key)
+        if frames is not None:
+            return frames
+
+        if flipped:
+            frames = [[pygame.transform.flip(frame, True, False) for frame in row]
+                      for row in self.frames(path, columns, rows, resize_to)]
+        else:
+            frames = _slice(self.scaled_sheet(path, mtime, columns, rows, resize_to), columns, rows)
+        self.frame_sets[key] = frames
+        return frames
+
+    def scaled_sheet(self, path, mtime, columns, rows, resize_to):
+        """The sheet with every frame scaled to resize_to, via the disk cache if enabled"""
+        if resize_to is None:
+            return self.sheet(path)
+
+        cache_path = None
+        if self.cache_dir:
+            name = os.path.splitext(os.path.basename(path))[0]
+            # Same-named sheets in different directories get their own entries
+            source = hashlib.sha1(os.path.realpath(path).encode()).hexdigest()[:12]
+            cache_path = os.path.join(
+                self.cache_dir,
+                f"{name}-{source}-{mtime}-{columns}x{rows}-{resize_to[0]}x{resize_to[1]}.png")
+            if os.path.exists(cache_path):
+                try:
+                    return _convert(pygame.image.load(cache_path))
+                except pygame.error:
+                    pass  # Unreadable entry; rebuild it below
+
+        width, height = resize_to
+        sheet = pygame.Surface((columns * width, rows * height), pygame.SRCALPHA)
+        for row, frames in enumerate(_slice(self.sheet(path), columns, rows)):
+            for col, frame in enumerate(frames):
+                sheet.blit(pygame.transform.smoothscale(frame, resize_to), (col * width, row * height))
+
+        if cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp.png"
+            pygame.image.save(sheet, tmp_path)
+            os.replace(tmp_path, cache_path)
+        return _convert(sheet)
+
+assets = AssetManager()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from headless import HeadlessGame, PathAgent
+from main import GameState
+from player import PlayerState
+
+def run_episode(seed, max_ticks=20000, aggression=None, detection_radius=None, trap_density=None):
+    """Play one full game with PathAgent and return its stats as a dict"""
+    maze_options = {} if trap_density is None else {'trap_density': trap_density}
+    game = HeadlessGame(PathAgent(), maze_options=maze_options, seed=seed)
+    for enemy in game.maze.enemies:
+        if aggression is not None:
+            enemy.aggression = aggression
+        if detection_radius is not None:
+            enemy.detection_radius = detection_radius
+
+    damage = 0
+    teleports = 0
+    ticks = 0
+    while game.state == GameState.RUNNING and ticks < max_ticks:
+        health, state = game.player.health, game.player.state
+        game.update()
+        ticks += 1
+        damage += health - game.player.health
+        if game.player.state == PlayerState.TELEPORTING and state != PlayerState.TELEPORTING:
+            teleports += 1
+
+    outcome = {GameState.VICTORY: 'exit', GameState.GAME_OVER: 'dead'}.get(game.state, 'timeout')
+    return {
+        'seed': seed,
+        'outcome': outcome,
+        'ticks': ticks,
+        'time_to_exit': game.game_time if outcome == 'exit' else None,
+        'damage_taken': damage,
+        'teleports_used': teleports,
+    }
+
+def _run_seed(job):
+    seed, options = job
+    return run_episode(seed, **options)
+
+def run_batch(seeds, workers=None, shard_size=8, **options):
+    """
+    Yield per-episode stats as workers finish them. Seeds are handed to the
+    process pool in shards of `shard_size` to keep IPC overhead low.
+    """
+    jobs = [(seed, options) for seed in seeds]
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_seed, jobs, chunksize=shard_size)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate maze/enemy tuning over many seeds")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=8)
+    parser.add_argument("--max-ticks", type=int, default=20000)
+    parser.add_argument("--aggression", type=float, default=None)
+    parser.add_argument("--detection-radius", type=int, default=None)
+    parser.add_argument("--trap-density", type=float, default=None)
+    parser.add_argument("--out", default=None, help="JSON lines file (default: stdout)")
+    args = parser.parse_args()
+
+    seeds = range(args.first_seed, args.first_seed + args.episodes)
+    out = open(args.out, "w") if args.out else sys.stdout
+    outcomes = {}
+    start = time.perf_counter()
+    for stats in run_batch(seeds, args.workers, args.shard_size, max_ticks=args.max_ticks,
+                           aggression=args.aggression, detection_radius=args.detection_radius,
+                           trap_density=args.trap_density):
+        outcomes[stats['outcome']] = outcomes.get(stats['outcome'], 0) + 1
+        out.write(json.dumps(stats) + "\n")
+        out.flush()
+    elapsed = time.perf_counter() - start
+    if args.out:
+        out.close()
+
+    print(f"{args.episodes} episodes on {args.workers} worker(s) in {elapsed:.1f}s "
+          f"({args.episodes / elapsed:.1f} episodes/s): {outcomes}", file=sys.stderr)
@@ -0,0 +1,189 @@
+"""
+Headless benchmark suite. Times maze generation/reset, drawing an explored
+maze, enemy updates, player collision checks and sprite sheet loading, then
+compares the medians against benchmarks/baseline.json.
+
+    python benchmarks/run.py                  # full run, compare with the baseline
+    python benchmarks/run.py --quick          # small sizes only
+    python benchmarks/run.py --save-baseline  # record this machine's numbers
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+from camera import Camera
+from collision import sweep
+from fog import FogOfWar
+from loader import load_character_sheet, clear_cache
+from maze import Maze
+from player import Player
+from timestep import SimClock
+from utils.settings import SCREEN_WIDTH, SCREEN_HEIGHT, CELL_SIZE, PATH_WIDTH
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+SPRITE_DIR = os.path.join(ROOT, "assets", "sprites", "character")
+
+def measure(func, number=1, repeat=5):
+    """Median and best ms per call of func() over `repeat` runs of `number` calls"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return {'median_ms': statistics.median(times), 'min_ms': min(times),
+            'number': number, 'repeat': repeat}
+
+def build_maze(size, enemies=5):
+    return Maze(clock=SimClock(), seed=1, cols=size, rows=size, enemy_count=enemies)
+
+def bench_generation(sizes):
+    for size in sizes:
+        maze = build_maze(size, enemies=0)
+        repeat = 5 if size <= 300 else 2
+        yield f"generate_maze/{size}x{size}", measure(maze.generate_maze, repeat=repeat)
+        yield f"reset_maze/{size}x{size}", measure(maze.reset_maze, repeat=repeat)
+
+def bench_draw(screen, sizes):
+    for size in sizes:
+        maze = build_maze(size)
+        fog = FogOfWar(maze.cols, maze.rows)
+        fog.reveal_all()
+        camera = Camera()
+        player = Player(size // 2 * CELL_SIZE, size // 2 * CELL_SIZE, clock=maze.clock)
+        for _ in range(200):  # Let the camera settle on the player
+            camera.follow(player)
+        args = (screen, camera, fog, player.direction, player.rect.center)
+
+        def draw():
+            maze.draw(*args)
+        draw()  # Warm the chunk cache
+        yield f"draw_explored/{size}x{size}", measure(draw, number=20)
+        tile_cache, maze.tile_cache = maze.tile_cache, None
+        maze.chunk_cache_enabled = False
+        yield f"draw_explored_uncached/{size}x{size}", measure(draw, number=5)
+        maze.chunk_cache_enabled = True
+        maze.tile_cache = tile_cache
+
+def bench_enemies(counts, size):
+    direction = pygame.Vector2(1, 0)
+    for count in counts:
+        maze = build_maze(size, enemies=count)
+        center = (size // 2 * CELL_SIZE + CELL_SIZE // 2,) * 2
+
+        def update():
+            maze.update_enemies(center, direction, True)
+        yield f"update_enemies/{count}/{size}x{size}", measure(update, number=max(1, 2000 // count))
+
+def bench_collision(size):
+    maze = build_maze(size)
+    player = Player(0, 0, clock=maze.clock)
+    rng = random.Random(1)
+    rects = []
+    for _ in range(1000):
+        rect = player.rect.copy()
+        rect.x = rng.randrange(size) * CELL_SIZE + rng.randrange(-8, PATH_WIDTH)
+        rect.y = rng.randrange(size) * CELL_SIZE + rng.randrange(-8, PATH_WIDTH)
+        rects.append(rect)
+
+    def collide():
+        for rect in rects:
+            player.check_collision(rect, maze)
+    result = measure(collide, number=5)
+    result['calls_per_second'] = len(rects) * 1000 / result['median_ms']
+    yield f"check_collision/{size}x{size}", result
+
+    # Many fast actors, each swept in sub-steps against the walls
+    start = CELL_SIZE + (CELL_SIZE - player.rect.width) // 2
+    actors = [pygame.Rect(start, start, player.rect.width, player.rect.height) for _ in range(200)]
+    moves = [rng.choice([(24, 0), (-24, 0), (0, 24), (0, -24)]) for _ in actors]
+
+    def move():
+        for rect, (dx, dy) in zip(actors, moves):
+            rect.topleft = sweep(maze, rect, dx, dy)[:2]
+    yield f"sweep/200/{size}x{size}", measure(move, number=5)
+
+def bench_sprites():
+    for name in sorted(os.listdir(SPRITE_DIR)):
+        path = os.path.join(SPRITE_DIR, name)
+
+        def cold():
+            # Decode from the file every time, as on the first load
+            clear_cache()
+            load_character_sheet(path)
+        yield f"load_sprite_sheet/cold/{name}", measure(cold)
+        yield f"load_sprite_sheet/warm/{name}", measure(lambda: load_character_sheet(path), number=1000)
+
+def run(quick=False, only=None):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if quick:
+        suites = [bench_generation([30, 100]), bench_draw(screen, [30]),
+                  bench_enemies([5, 50, 500], 200), bench_collision(100), bench_sprites()]
+    else:
+        suites = [bench_generation([30, 100, 300, 1000]), bench_draw(screen, [30, 100]),
+                  bench_enemies([5, 50, 500, 5000], 200), bench_collision(100), bench_sprites()]
+
+    results = {}
+    for suite in suites:
+        for name, result in suite:
+            if only and only not in name:
+                continue
+            results[name] = result
+            print(f"{name:<40}{result['median_ms']:10.3f} ms", file=sys.stderr)
+    return results
+
+def compare(results, baseline, threshold):
+    """Names of benchmarks whose median grew more than `threshold` over the baseline"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old and result['median_ms'] > old['median_ms'] * (1 + threshold):
+            regressions.append(name)
+            print(f"REGRESSION {name}: {old['median_ms']:.3f} -> {result['median_ms']:.3f} ms",
+                  file=sys.stderr)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="Small sizes only")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks containing this")
+    parser.add_argument("--out", default=None, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Merge the results into the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown over the baseline median (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = run(args.quick, args.filter)
+    report = json.dumps(results, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+    elif compare(results, baseline, args.threshold):
+        sys.exit(1)
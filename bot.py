@@ -1,19 +1,25 @@
 import pygame
-from utils.settings import BOT_SPEED
+from collision import sweep
+from utils.settings import BOT_SPEED, SIM_RATE
 
 class Bot:
-    def __init__(self, x, y):
+    def __init__(self, x, y, speed=BOT_SPEED):
         self.rect = pygame.Rect(x, y, 20, 20)
+        self.speed = speed
 
-    def chase(self, target):
-        if self.rect.x < target.rect.x:
-            self.rect.x += BOT_SPEED
-        elif self.rect.x > target.rect.x:
-            self.rect.x -= BOT_SPEED
-        if self.rect.y < target.rect.y:
-            self.rect.y += BOT_SPEED
-        elif self.rect.y > target.rect.y:
-            self.rect.y -= BOT_SPEED
+    def chase(self, target, maze=None, dt=1000 / SIM_RATE):
+        """Step towards target for `dt` ms; with a maze the move is swept against its walls"""
+        stride = round(self.speed * dt / 1000)
+        dx = min(stride, abs(target.rect.x - self.rect.x))
+        dy = min(stride, abs(target.rect.y - self.rect.y))
+        if target.rect.x < self.rect.x:
+            dx = -dx
+        if target.rect.y < self.rect.y:
+            dy = -dy
+        if maze is None:
+            self.rect.move_ip(dx, dy)
+        else:
+            self.rect.topleft = sweep(maze, self.rect, dx, dy)[:2]
 
     def draw(self, screen):
         pygame.draw.rect(screen, (255, 0, 0), self.rect)
@@ -1,5 +1,5 @@
 import pygame
-from utils.settings import SCREEN_WIDTH, SCREEN_HEIGHT, CAMERA_ZOOM, CAMERA_SMOOTHNESS
+from utils.settings import SCREEN_WIDTH, SCREEN_HEIGHT, CAMERA_ZOOM, CAMERA_SMOOTHNESS, CELL_SIZE
 
 class Camera:
     def __init__(self):
@@ -35,4 +35,14 @@ class Camera:
         return (
             (pos[0] - self.display_offset.x) * self.zoom,
             (pos[1] - self.display_offset.y) * self.zoom
-        )
\ No newline at end of file
+        )
+    
+    def visible_cell_range(self, cols, rows):
+        """Half-open (x0, x1, y0, y1) range of grid cells covered by the screen"""
+        left = self.display_offset.x
+        top = self.display_offset.y
+        x0 = max(0, int(left // CELL_SIZE))
+        y0 = max(0, int(top // CELL_SIZE))
+        x1 = min(cols, int((left + SCREEN_WIDTH / self.zoom) // CELL_SIZE) + 1)
+        y1 = min(rows, int((top + SCREEN_HEIGHT / self.zoom) // CELL_SIZE) + 1)
+        return x0, x1, y0, y1
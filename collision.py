@@ -0,0 +1,92 @@
+from utils.settings import CELL_SIZE, PATH_WIDTH
+
+MARGIN = (CELL_SIZE - PATH_WIDTH) // 2  # Depth of a wall into each cell it borders
+MAX_STEP = max(1, MARGIN)  # Sub-step length; shorter than a wall, so nothing tunnels
+
+def allowed_box(mask):
+    """(left, top, right, bottom) of the part of a cell with walls `mask` an actor may cover"""
+    return (
+        MARGIN if mask & 8 else 0,
+        MARGIN if mask & 1 else 0,
+        CELL_SIZE - MARGIN if mask & 2 else CELL_SIZE,
+        CELL_SIZE - MARGIN if mask & 4 else CELL_SIZE,
+    )
+
+# One entry per combination of wall bits (see wall_grid.WALL_BITS)
+CELL_BOXES = tuple(allowed_box(mask) for mask in range(16))
+
+def collides(maze, x, y, width, height):
+    """
+    True if the box at (x, y) of width x height pixels leaves the maze or
+    covers a wall in any of the cells it overlaps, not just the one under
+    its centre, so big or fast actors can't clip corners.
+    """
+    if x < 0 or y < 0:
+        return True
+    right = x + width
+    bottom = y + height
+    x0, x1 = x // CELL_SIZE, (right - 1) // CELL_SIZE
+    y0, y1 = y // CELL_SIZE, (bottom - 1) // CELL_SIZE
+    if x1 >= maze.cols or y1 >= maze.rows:
+        return True
+
+    wall_mask = maze.wall_mask
+    if x0 == x1 and y0 == y1:
+        # Common case: the whole box sits in one cell
+        box_left, box_top, box_right, box_bottom = CELL_BOXES[wall_mask(x0, y0)]
+        x -= x0 * CELL_SIZE
+        y -= y0 * CELL_SIZE
+        return x < box_left or y < box_top or x + width > box_right or y + height > box_bottom
+
+    for gx in range(x0, x1 + 1):
+        left_edge = gx * CELL_SIZE
+        lo_x = x - left_edge  # Box edges relative to this cell; may run past it
+        hi_x = right - left_edge
+        for gy in range(y0, y1 + 1):
+            box_left, box_top, box_right, box_bottom = CELL_BOXES[wall_mask(gx, gy)]
+            top_edge = gy * CELL_SIZE
+            # Only the part of the box inside this cell counts
+            if (max(lo_x, 0) < box_left or min(hi_x, CELL_SIZE) > box_right or
+                    max(y - top_edge, 0) < box_top or min(bottom - top_edge, CELL_SIZE) > box_bottom):
+                return True
+    return False
+
+def sweep(maze, rect, dx, dy):
+    """
+    Move `rect` by (dx, dy) pixels, one axis at a time in sub-steps of at
+    most MAX_STEP, stopping flush against the first wall on each axis.
+    Returns the new (x, y) and whether anything was hit.
+    """
+    x, y = rect.x, rect.y
+    width, height = rect.width, rect.height
+    dx, dy = int(dx), int(dy)
+    hit = False
+
+    while dx:
+        step = max(-MAX_STEP, min(MAX_STEP, dx))
+        if collides(maze, x + step, y, width, height):
+            # Creep up to the wall a pixel at a time
+            unit = 1 if step > 0 else -1
+            for _ in range(abs(step) - 1):
+                if collides(maze, x + unit, y, width, height):
+                    break
+                x += unit
+            hit = True
+            break
+        x += step
+        dx -= step
+
+    while dy:
+        step = max(-MAX_STEP, min(MAX_STEP, dy))
+        if collides(maze, x, y + step, width, height):
+            unit = 1 if step > 0 else -1
+            for _ in range(abs(step) - 1):
+                if collides(maze, x, y + unit, width, height):
+                    break
+                y += unit
+            hit = True
+            break
+        y += step
+        dy -= step
+
+    return x, y, hit
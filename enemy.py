@@ -0,0 +1,33 @@
+from utils.settings import ENEMY_DETECTION_RADIUS
+
+class Enemy:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.speed = 1
+        self.aggression = 0.5  # 0-1 how aggressive the enemy is
+        self.detection_radius = ENEMY_DETECTION_RADIUS  # cells; None = no limit
+        self.visible = False
+    
+    def move_toward_player(self, player_x, player_y, maze):
+        # Follow the shared distance field downhill towards the player;
+        # outside its range fall back to heading straight for them
+        step = maze.distance_field.next_step(self.x, self.y)
+        if (self.detection_radius is not None and
+                abs(player_x - self.x) + abs(player_y - self.y) > self.detection_radius):
+            # Hasn't noticed the player: wander
+            dx, dy = maze.rng.choice([(1,0), (-1,0), (0,1), (0,-1)])
+        elif step:
+            dx, dy = step
+        else:
+            dx = 1 if player_x > self.x else -1 if player_x < self.x else 0
+            dy = 1 if player_y > self.y else -1 if player_y < self.y else 0
+        
+        # Randomize movement sometimes
+        if maze.rng.random() > self.aggression:
+            dx, dy = maze.rng.choice([(1,0), (-1,0), (0,1), (0,-1)])
+        
+        # Check if movement is possible
+        if maze.can_move(self.x, self.y, (dx, dy)):
+            self.x += dx
+            self.y += dy
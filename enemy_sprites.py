@@ -0,0 +1,24 @@
+import pygame
+from utils.settings import ENEMY_ALPHA_STEP
+
+class EnemySpriteAtlas:
+    """
+    Enemy circles pre-rendered once per (radius, alpha level). Alpha is
+    quantized to ENEMY_ALPHA_STEP so only a few dozen surfaces ever exist.
+    """
+    def __init__(self, color=(255, 0, 0), alpha_step=ENEMY_ALPHA_STEP):
+        self.color = color
+        self.alpha_step = alpha_step
+        self.sprites = {}
+
+    def get(self, radius, alpha):
+        alpha = min(255, alpha - alpha % self.alpha_step + self.alpha_step // 2)
+        key = (radius, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.color, alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+enemy_sprites = EnemySpriteAtlas()
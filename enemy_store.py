@@ -0,0 +1,154 @@
+from enemy import Enemy
+from pathfinding import neighbour_steps
+
+try:
+    import numpy as np
+except ImportError:  # The store is optional; Maze falls back to Enemy objects
+    np = None
+
+# Wall bit for a step, indexed by (dx + 1) * 3 + (dy + 1); 0 = not a move
+STEP_BITS = None
+if np is not None:
+    STEP_BITS = np.zeros(9, dtype=np.uint8)
+    for bit, _, (dx, dy) in neighbour_steps(1):
+        STEP_BITS[(dx + 1) * 3 + dy + 1] = bit
+
+UNLIMITED = 2**31 - 1  # detection_radius entry standing for None (always chase)
+
+def numpy_available():
+    return np is not None
+
+class EnemyView(Enemy):
+    """Enemy whose attributes live in one row of an EnemyStore"""
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self):
+        return int(self.store.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        self.store.x[self.index] = value
+
+    @property
+    def y(self):
+        return int(self.store.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        self.store.y[self.index] = value
+
+    @property
+    def speed(self):
+        return int(self.store.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.store.speed[self.index] = value
+
+    @property
+    def aggression(self):
+        return float(self.store.aggression[self.index])
+
+    @aggression.setter
+    def aggression(self, value):
+        self.store.aggression[self.index] = value
+
+    @property
+    def detection_radius(self):
+        radius = int(self.store.detection_radius[self.index])
+        return None if radius == UNLIMITED else radius
+
+    @detection_radius.setter
+    def detection_radius(self, value):
+        self.store.detection_radius[self.index] = UNLIMITED if value is None else value
+
+    @property
+    def visible(self):
+        return bool(self.store.visible[self.index])
+
+    @visible.setter
+    def visible(self, value):
+        self.store.visible[self.index] = value
+
+class EnemyStore:
+    """
+    Structure-of-arrays enemy state (NumPy) updated with batched array
+    operations against the packed wall grid and the shared distance field.
+    `views` holds one EnemyView per enemy for code that wants objects.
+    """
+    def __init__(self, positions, seed=None):
+        template = Enemy(0, 0)
+        count = len(positions)
+        self.x = np.array([x for x, _ in positions], dtype=np.int32)
+        self.y = np.array([y for _, y in positions], dtype=np.int32)
+        self.speed = np.full(count, template.speed, dtype=np.int32)
+        self.aggression = np.full(count, template.aggression, dtype=np.float64)
+        radius = UNLIMITED if template.detection_radius is None else template.detection_radius
+        self.detection_radius = np.full(count, radius, dtype=np.int32)
+        self.visible = np.zeros(count, dtype=bool)
+        self.rng = np.random.default_rng(seed)
+        self.views = [EnemyView(self, i) for i in range(count)]
+
+    def __len__(self):
+        return len(self.x)
+
+    def visible_indices(self):
+        return np.flatnonzero(self.visible).tolist()
+
+    def update(self, maze, player_x, player_y, player_direction, player_light_on, sight=None):
+        """
+        Vectorized equivalent of updating and moving every Enemy; returns
+        moved indices. `sight` holds the cell indices the player can see.
+        """
+        count = len(self.x)
+        if not count:
+            return ()
+        rng = self.rng
+
+        # Visible if close, in front of the player and lit
+        rel_x = self.x - player_x
+        rel_y = self.y - player_y
+        dot = player_direction.x * rel_x + player_direction.y * rel_y
+        self.visible[:] = (rel_x * rel_x + rel_y * rel_y < 25) & (dot > -0.5) & bool(player_light_on)
+        if sight is not None and self.visible.any():
+            seen = np.fromiter(sight, dtype=np.int64, count=len(sight))
+            self.visible &= np.isin(self.x * maze.rows + self.y, seen)
+        movers = ~self.visible | (rng.random(count) > 0.8)
+
+        # Default step: straight at the player (diagonals are refused below)
+        step_x = np.sign(player_x - self.x).astype(np.int32)
+        step_y = np.sign(player_y - self.y).astype(np.int32)
+
+        # Downhill on the distance field where it covers the enemy
+        field = maze.distance_field
+        walls = np.frombuffer(maze.grid.walls, dtype=np.uint8)
+        dist = np.frombuffer(field.dist, dtype=np.int32)
+        fresh = np.frombuffer(field.stamp, dtype=np.uint32) == field.generation
+        index = self.x * maze.rows + self.y
+        mask = walls[index]
+        here = np.where(fresh[index], dist[index], -1)
+        found = here <= 0
+        for bit, delta, (dx, dy) in neighbour_steps(maze.rows):
+            open_side = (mask & bit) == 0
+            target = np.where(open_side, index + delta, index)
+            downhill = ~found & open_side & fresh[target] & (dist[target] == here - 1)
+            step_x[downhill] = dx
+            step_y[downhill] = dy
+            found |= downhill
+
+        # Randomize movement sometimes, and always when the player is out of range
+        wander = (rng.random(count) > self.aggression) | (np.abs(rel_x) + np.abs(rel_y) > self.detection_radius)
+        if wander.any():
+            choice = rng.integers(0, 4, int(wander.sum()))
+            step_x[wander] = np.array([1, -1, 0, 0], dtype=np.int32)[choice]
+            step_y[wander] = np.array([0, 0, 1, -1], dtype=np.int32)[choice]
+
+        # Wall check against the bit for each step
+        bits = STEP_BITS[(step_x + 1) * 3 + step_y + 1]
+        moving = movers & (bits != 0) & ((mask & bits) == 0)
+        self.x += np.where(moving, step_x, 0)
+        self.y += np.where(moving, step_y, 0)
+        return np.flatnonzero(moving).tolist()
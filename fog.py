@@ -0,0 +1,126 @@
+from utils.settings import VISIBLE_RADIUS
+
+class FogOfWar:
+    """
+    Explored cells as one byte per cell (same column-major layout as
+    WallGrid). update() only does work when the player enters a new cell
+    and, given a Visibility, reveals only what is in line of sight.
+    `revealed` lists cells in the order they were uncovered, so consumers
+    (chunk cache, minimap) keep an offset into it and read just the delta.
+    Offsets count from the first cell ever revealed; trim() drops the cells
+    every consumer has read.
+    """
+    def __init__(self, cols, rows, radius=VISIBLE_RADIUS, visibility=None):
+        self.cols = cols
+        self.rows = rows
+        self.radius = radius
+        self.visibility = visibility
+        self.explored = bytearray(cols * rows)
+        self.revealed = []
+        self.base = 0  # Offset of revealed[0]
+        self.cell = None  # Cell the last update() was centred on
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.explored[x * self.rows + y] == 1
+
+    def __len__(self):
+        return self.base + len(self.revealed)
+
+    def is_explored(self, x, y):
+        return self.explored[x * self.rows + y] == 1
+
+    def reveal(self, x, y):
+        """Mark (x, y) explored; True if it was still hidden"""
+        index = x * self.rows + y
+        if self.explored[index]:
+            return False
+        self.explored[index] = 1
+        self.revealed.append((x, y))
+        return True
+
+    def update(self, cell_x, cell_y):
+        """Reveal around the player's cell; returns the newly revealed cells"""
+        if (cell_x, cell_y) == self.cell:
+            return ()
+        self.cell = (cell_x, cell_y)
+        start = len(self.revealed)
+        radius = self.radius
+        if self.visibility:
+            for index in self.visibility.visible(cell_x, cell_y, radius):
+                self.reveal(*divmod(index, self.rows))
+            return self.revealed[start:]
+        for x in range(max(0, cell_x - radius), min(self.cols, cell_x + radius + 1)):
+            for y in range(max(0, cell_y - radius), min(self.rows, cell_y + radius + 1)):
+                self.reveal(x, y)
+        return self.revealed[start:]
+
+    def refresh(self):
+        """Look again from the current cell on the next update (e.g. walls moved)"""
+        self.cell = None
+
+    def reveal_all(self):
+        for x in range(self.cols):
+            for y in range(self.rows):
+                self.reveal(x, y)
+
+    def revealed_since(self, offset):
+        """Cells revealed after the first `offset`, and the offset to pass next time"""
+        return self.revealed[max(0, offset - self.base):], len(self)
+
+    def trim(self, offset):
+        """Forget the cells revealed before `offset`, once every consumer is past it"""
+        if offset > self.base:
+            del self.revealed[:offset - self.base]
+            self.base = offset
+
+class SparseFog(FogOfWar):
+    """
+    FogOfWar for a World too big for one byte per cell: explored bytes are
+    kept per chunk and only for chunks the player has seen into. The World
+    pages them out to its ChunkStore along with the chunk (evict_chunk and
+    load_chunk), so only resident chunks hold fog in memory.
+    """
+    def __init__(self, cols, rows, chunk_size, radius=VISIBLE_RADIUS, visibility=None):
+        self.cols = cols
+        self.rows = rows
+        self.chunk_size = chunk_size
+        self.radius = radius
+        self.visibility = visibility
+        self.chunks = {}  # (cx, cy) -> bytearray, column-major within the chunk
+        self.revealed = []
+        self.base = 0
+        self.cell = None
+
+    def __contains__(self, cell):
+        x, y = cell
+        return 0 <= x < self.cols and 0 <= y < self.rows and self.is_explored(x, y)
+
+    def is_explored(self, x, y):
+        cx, lx = divmod(x, self.chunk_size)
+        cy, ly = divmod(y, self.chunk_size)
+        explored = self.chunks.get((cx, cy))
+        return explored is not None and explored[lx * self.chunk_size + ly] == 1
+
+    def reveal(self, x, y):
+        size = self.chunk_size
+        cx, lx = divmod(x, size)
+        cy, ly = divmod(y, size)
+        explored = self.chunks.get((cx, cy))
+        if explored is None:
+            explored = self.chunks[(cx, cy)] = bytearray(size * size)
+        index = lx * size + ly
+        if explored[index]:
+            return False
+        explored[index] = 1
+        self.revealed.append((x, y))
+        return True
+
+    def evict_chunk(self, key):
+        """Explored bytes of chunk `key` (None if never seen into), dropped from memory"""
+        return self.chunks.pop(key, None)
+
+    def load_chunk(self, key, explored):
+        """Take back explored bytes written out by evict_chunk"""
+        if any(explored):
+            self.chunks[key] = bytearray(explored)
@@ -0,0 +1,195 @@
+import random
+from utils.settings import MAZE_ALGORITHM
+
+# Part of the maze cache key: bump it whenever a change here or in Maze's
+# layout code makes a seed produce a different maze
+GENERATOR_VERSION = 1
+
+# Wall name -> (dx, dy) of the neighbour on the other side
+DIRECTIONS = (
+    ('top', 0, -1),
+    ('right', 1, 0),
+    ('bottom', 0, 1),
+    ('left', -1, 0),
+)
+OFFSETS = {name: (dx, dy) for name, dx, dy in DIRECTIONS}
+OPPOSITE = {'top': 'bottom', 'bottom': 'top', 'left': 'right', 'right': 'left'}
+
+# Every generator below yields carved passages as (x, y, wall) tuples: the
+# wall named `wall` of cell (x, y) and the matching wall of its neighbour are
+# knocked down. Cells are indexed column-major (x * rows + y) like Maze.grid.
+
+
+def _open_neighbours(x, y, cols, rows, visited):
+    """Unvisited neighbours of (x, y) as (wall, nx, ny)"""
+    found = []
+    for name, dx, dy in DIRECTIONS:
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < cols and 0 <= ny < rows and not visited[nx * rows + ny]:
+            found.append((name, nx, ny))
+    return found
+
+
+def prim(cols, rows, start, rng):
+    """Randomized Prim's with an O(1) swap-pop frontier"""
+    visited = bytearray(cols * rows)
+    sx, sy = start
+    visited[sx * rows + sy] = 1
+    frontier = [(sx, sy, name, nx, ny)
+                for name, nx, ny in _open_neighbours(sx, sy, cols, rows, visited)]
+
+    while frontier:
+        # Swap a random entry to the end so removal doesn't shift the list
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        x, y, name, nx, ny = frontier.pop()
+
+        if visited[nx * rows + ny]:
+            continue
+        visited[nx * rows + ny] = 1
+        yield x, y, name
+        frontier.extend((nx, ny, n, fx, fy)
+                        for n, fx, fy in _open_neighbours(nx, ny, cols, rows, visited))
+
+
+def recursive_backtracker(cols, rows, start, rng):
+    """Depth-first search with an explicit stack (long, winding corridors)"""
+    visited = bytearray(cols * rows)
+    sx, sy = start
+    visited[sx * rows + sy] = 1
+    stack = [start]
+
+    while stack:
+        x, y = stack[-1]
+        options = _open_neighbours(x, y, cols, rows, visited)
+        if not options:
+            stack.pop()
+            continue
+        name, nx, ny = options[rng.randrange(len(options))]
+        visited[nx * rows + ny] = 1
+        yield x, y, name
+        stack.append((nx, ny))
+
+
+def kruskal(cols, rows, start, rng):
+    """Kruskal's over a shuffled edge list with a union-find forest"""
+    # Edges are packed as cell * 2 + (0 = right wall, 1 = bottom wall)
+    edges = [i * 2 for i in range((cols - 1) * rows)]
+    edges.extend(
+        (x * rows + y) * 2 + 1 for x in range(cols) for y in range(rows - 1)
+    )
+    rng.shuffle(edges)
+
+    parent = list(range(cols * rows))
+    size = [1] * (cols * rows)
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # Path halving
+            i = parent[i]
+        return i
+
+    for edge in edges:
+        a, vertical = edge >> 1, edge & 1
+        b = a + 1 if vertical else a + rows
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            continue
+        if size[ra] < size[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        size[ra] += size[rb]
+        yield a // rows, a % rows, 'bottom' if vertical else 'right'
+
+
+def wilson(cols, rows, start, rng):
+    """Wilson's loop-erased random walks (uniform spanning tree, unbiased)"""
+    n = cols * rows
+    in_tree = bytearray(n)
+    in_tree[start[0] * rows + start[1]] = 1
+    walk = bytearray(n)  # Last direction taken out of each cell on this walk
+
+    order = list(range(n))
+    rng.shuffle(order)
+    for origin in order:
+        if in_tree[origin]:
+            continue
+
+        # Random walk until the tree is hit; overwriting `walk` erases loops
+        cell = origin
+        while not in_tree[cell]:
+            x, y = divmod(cell, rows)
+            while True:
+                d = rng.randrange(4)
+                _, dx, dy = DIRECTIONS[d]
+                if 0 <= x + dx < cols and 0 <= y + dy < rows:
+                    break
+            walk[cell] = d
+            cell = (x + dx) * rows + y + dy
+
+        # Retrace the loop-erased path and add it to the tree
+        cell = origin
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            x, y = divmod(cell, rows)
+            name, dx, dy = DIRECTIONS[walk[cell]]
+            yield x, y, name
+            cell = (x + dx) * rows + y + dy
+
+
+def eller(cols, rows, start, rng):
+    """Eller's row-by-row algorithm; only one row of set state is kept"""
+    row_sets = [None] * cols
+    next_set = 0
+
+    for y in range(rows):
+        last_row = y == rows - 1
+        members = {}
+        for x in range(cols):
+            if row_sets[x] is None:
+                row_sets[x] = next_set
+                next_set += 1
+            members.setdefault(row_sets[x], []).append(x)
+
+        # Randomly join adjacent cells of different sets (all of them on the
+        # last row so everything ends up connected)
+        for x in range(cols - 1):
+            a, b = row_sets[x], row_sets[x + 1]
+            if a == b or not (last_row or rng.random() < 0.5):
+                continue
+            yield x, y, 'right'
+            if len(members[a]) < len(members[b]):
+                a, b = b, a
+            for k in members[b]:
+                row_sets[k] = a
+            members[a].extend(members.pop(b))
+
+        if last_row:
+            break
+
+        # Every set carries at least one passage down into the next row
+        below = [None] * cols
+        for set_id, xs in members.items():
+            rng.shuffle(xs)
+            for i, x in enumerate(xs):
+                if i == 0 or rng.random() < 0.3:
+                    yield x, y, 'bottom'
+                    below[x] = set_id
+        row_sets = below
+
+
+GENERATORS = {
+    'prim': prim,
+    'backtracker': recursive_backtracker,
+    'kruskal': kruskal,
+    'wilson': wilson,
+    'eller': eller,
+}
+
+
+def carve_passages(cols, rows, start, algorithm=None, rng=random):
+    """Yield the (x, y, wall) passages of a perfect maze of cols x rows cells"""
+    algorithm = algorithm or MAZE_ALGORITHM
+    if algorithm not in GENERATORS:
+        raise ValueError(f"Unknown maze algorithm: {algorithm}")
+    return GENERATORS[algorithm](cols, rows, start, rng)
@@ -0,0 +1,172 @@
+import argparse
+import random
+import time
+import pygame
+from main import Game, GameState
+from level_manager import LevelManager
+from level_pipeline import LevelPipeline
+from timestep import SimClock
+from utils.settings import SIM_RATE, CELL_SIZE
+
+MOVE_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+class KeyState:
+    """Indexable like pygame.key.get_pressed() for a fixed set of held keys"""
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+NO_KEYS = KeyState()
+
+class ScriptedInput:
+    """Replays [(ticks, keys), ...] in a loop, holding `keys` for `ticks` frames"""
+    def __init__(self, script):
+        self.script = [(ticks, KeyState(keys)) for ticks, keys in script]
+        self.index = 0
+        self.remaining = self.script[0][0] if self.script else 0
+
+    def keys(self, game):
+        if not self.script:
+            return NO_KEYS
+        while self.remaining <= 0:
+            self.index = (self.index + 1) % len(self.script)
+            self.remaining = self.script[self.index][0]
+        self.remaining -= 1
+        return self.script[self.index][1]
+
+class RandomInput:
+    """Holds a random arrow key for a random number of frames"""
+    def __init__(self, seed=None, min_hold=10, max_hold=60):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.current = NO_KEYS
+        self.remaining = 0
+
+    def keys(self, game):
+        if self.remaining <= 0:
+            self.current = KeyState([self.rng.choice(MOVE_KEYS)])
+            self.remaining = self.rng.randint(self.min_hold, self.max_hold)
+        self.remaining -= 1
+        return self.current
+
+class PathAgent:
+    """
+    Scripted player that walks the A* path to the exit, steering around
+    untriggered traps where the maze offers another way. It lines up with
+    the middle of its cell before each turn and re-plans after teleports,
+    maze resets or getting stuck.
+    """
+    KEYS = {(1, 0): KeyState([pygame.K_RIGHT]), (-1, 0): KeyState([pygame.K_LEFT]),
+            (0, 1): KeyState([pygame.K_DOWN]), (0, -1): KeyState([pygame.K_UP])}
+
+    def __init__(self, stuck_ticks=30, trap_cost=50):
+        self.path = None
+        self.steps = {}  # Cell -> its index in path
+        self.maze = None
+        self.reset_time = None
+        self.last_center = None
+        self.stuck = 0
+        self.stuck_ticks = stuck_ticks
+        self.trap_cost = trap_cost  # Extra steps a trap is worth avoiding by
+
+    def plan(self, maze, cell):
+        self.maze = maze
+        self.reset_time = maze.reset_time
+        self.path = maze.find_path(cell, maze.exit_pos, self.trap_cost)
+        self.steps = {step: i for i, step in enumerate(self.path or ())}
+        self.stuck = 0
+
+    def keys(self, game):
+        maze = game.maze
+        center = game.player.rect.center
+        cell = (center[0] // CELL_SIZE, center[1] // CELL_SIZE)
+
+        self.stuck = self.stuck + 1 if center == self.last_center else 0
+        self.last_center = center
+        if (maze is not self.maze or maze.reset_time != self.reset_time
+                or not self.path or cell not in self.steps or self.stuck > self.stuck_ticks):
+            self.plan(maze, cell)
+        if not self.path:
+            return NO_KEYS
+
+        index = self.steps[cell]
+        if index + 1 >= len(self.path):
+            return NO_KEYS
+        next_x, next_y = self.path[index + 1]
+        step_x, step_y = next_x - cell[0], next_y - cell[1]
+
+        # Get onto the middle line of the current cell before moving across
+        mid_x = cell[0] * CELL_SIZE + CELL_SIZE // 2
+        mid_y = cell[1] * CELL_SIZE + CELL_SIZE // 2
+        stride = game.player.speed * game.frame_ms / 1000  # Pixels per tick
+        if step_x and abs(center[1] - mid_y) >= stride:
+            return self.KEYS[(0, 1 if mid_y > center[1] else -1)]
+        if step_y and abs(center[0] - mid_x) >= stride:
+            return self.KEYS[(1 if mid_x > center[0] else -1, 0)]
+        return self.KEYS[(step_x, step_y)]
+
+class HeadlessGame(Game):
+    """
+    Game without a window: no pygame.init, no event pump and no drawing.
+    Time comes from an injectable clock (anything with get_ticks and
+    advance) advanced by frame_ms per tick and keys from an input source,
+    so the simulation runs as fast as the CPU allows.
+    """
+    def __init__(self, input_source=None, clock=None, frame_ms=1000 / SIM_RATE, maze_options=None,
+                 seed=None, maze_cache_dir=None):
+        self.time_source = self.sim_clock = clock or SimClock()
+        self.maze = None  # reset_game closes the previous World before building the next
+        self.maze_options = maze_options or {}
+        self.maze_cache_dir = maze_cache_dir
+        self.seed = seed
+        # Restarts replay the same level, so nothing is built ahead
+        self.levels = LevelManager(LevelPipeline(seed, depth=0, clock=self.time_source,
+                                                 cache_dir=maze_cache_dir, **self.maze_options))
+        self.input_source = input_source or RandomInput()
+        self.frame_ms = frame_ms
+        self.reset_game()
+
+    def handle_events(self):
+        pass
+
+    def draw(self):
+        pass
+
+    def update(self):
+        if self.state != GameState.RUNNING:
+            return
+        self.step(self.input_source.keys(self), self.frame_ms)
+
+    def run(self, ticks, restart=True):
+        """Simulate `ticks` frames, restarting finished games; returns stats"""
+        games = 1
+        done = 0
+        start = time.perf_counter()
+        while done < ticks:
+            if self.state != GameState.RUNNING:
+                if not restart:
+                    break
+                self.reset_game()
+                games += 1
+            self.update()
+            done += 1
+        elapsed = time.perf_counter() - start
+        return {
+            'ticks': done,
+            'games': games,
+            'seconds': elapsed,
+            'ticks_per_second': done / elapsed if elapsed else float('inf'),
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the maze game without a display")
+    parser.add_argument("--ticks", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the random input")
+    args = parser.parse_args()
+
+    stats = HeadlessGame(RandomInput(args.seed)).run(args.ticks)
+    print(f"{stats['ticks']} ticks over {stats['games']} game(s) in {stats['seconds']:.2f}s "
+          f"({stats['ticks_per_second']:.0f} ticks/s)")
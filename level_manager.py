@@ -1,7 +1,8 @@
 class LevelManager:
-    def __init__(self):
+    def __init__(self, pipeline=None):
         self.score = 0
         self.level = 1
+        self.pipeline = pipeline  # LevelPipeline that builds the mazes
 
     def update_score(self, points):
         self.score += points
@@ -9,3 +10,14 @@ class LevelManager:
             self.level += 1
             return True  # trigger maze regeneration
         return False
+
+    def advance(self):
+        self.level += 1
+
+    def current_maze(self):
+        """A fresh maze for the current level, ready-made if it was prefetched"""
+        return self.pipeline.get(self.level)
+
+    def close(self):
+        if self.pipeline:
+            self.pipeline.close()
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from maze_cache import load_or_build, dumps, loads
+from utils.settings import LEVEL_PREFETCH, LEVEL_PREFETCH_PROCESSES
+
+def level_seed(base_seed, level):
+    """Seed of `level`; level 1 uses the base seed itself"""
+    return (base_seed + (level - 1) * 0x9E3779B1) % 2**32
+
+def _build_layout(seed, cache_dir, options):
+    # Runs in a worker process: ship the layout back as bytes
+    return dumps(load_or_build(seed, cache_dir, **options))
+
+class LevelPipeline:
+    """
+    Builds the mazes of the next `depth` levels in the background while the
+    current one is played, so a level transition only has to pick up a
+    ready maze. depth=0 builds every maze synchronously on request.
+
+    Built layouts are kept in memory, so restarting a level reloads it
+    without touching the disk; the on-disk cache is only used when a
+    cache_dir is given (games with a fixed seed).
+    """
+    def __init__(self, base_seed, depth=LEVEL_PREFETCH, use_processes=LEVEL_PREFETCH_PROCESSES,
+                 clock=None, cache_dir=None, **maze_options):
+        self.base_seed = base_seed
+        self.depth = depth
+        self.use_processes = use_processes
+        self.clock = clock
+        self.cache_dir = cache_dir
+        self.maze_options = maze_options
+        self.pending = {}  # level -> Future
+        self.layouts = {}  # level -> dumps() bytes of mazes already built
+        self.executor = None
+        if depth > 0:
+            executor_type = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            self.executor = executor_type(max_workers=1)
+
+    def seed_for(self, level):
+        if self.base_seed is None:
+            return None
+        return level_seed(self.base_seed, level)
+
+    def submit(self, level):
+        seed = self.seed_for(level)
+        if self.use_processes:
+            return self.executor.submit(_build_layout, seed, self.cache_dir, self.maze_options)
+        return self.executor.submit(load_or_build, seed, self.cache_dir,
+                                    clock=self.clock, **self.maze_options)
+
+    def get(self, level):
+        """A fresh Maze for `level`; prefetched when possible, built here otherwise"""
+        for old in [old for old in self.layouts if old < level]:
+            del self.layouts[old]
+        layout = self.layouts.get(level)
+        future = self.pending.pop(level, None)
+        if layout is not None:
+            if future:
+                future.cancel()
+            maze = loads(layout, seed=self.seed_for(level), clock=self.clock, **self.maze_options)
+        elif future is None:
+            maze = load_or_build(self.seed_for(level), self.cache_dir,
+                                 clock=self.clock, **self.maze_options)
+            self.layouts[level] = dumps(maze)
+        else:
+            maze = future.result()
+            if self.use_processes:
+                self.layouts[level] = maze
+                maze = loads(maze, seed=self.seed_for(level), clock=self.clock, **self.maze_options)
+            else:
+                self.layouts[level] = dumps(maze)
+
+        self.prefetch(level + 1)
+        return maze
+
+    def prefetch(self, first_level):
+        """Queue builds for first_level .. first_level + depth - 1, dropping stale ones"""
+        if not self.executor:
+            return
+        wanted = range(first_level, first_level + self.depth)
+        for level in list(self.pending):
+            if level not in wanted:
+                self.pending.pop(level).cancel()
+        for level in wanted:
+            if level not in self.pending:
+                self.pending[level] = self.submit(level)
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
+        self.layouts.clear()
@@ -0,0 +1,68 @@
+import pygame
+from utils.settings import FOG_COLOR, AMBIENT_DARKNESS
+
+def radial_gradient(radius, inner_alpha, outer_alpha, background_alpha=0):
+    """Fog-colored disc fading from inner_alpha at the center to outer_alpha at the rim"""
+    size = max(1, radius * 2)
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    surface.fill((*FOG_COLOR, background_alpha))
+    for r in range(radius, 0, -1):
+        alpha = int(inner_alpha + (outer_alpha - inner_alpha) * (r / radius))
+        pygame.draw.circle(surface, (*FOG_COLOR, alpha), (radius, radius), r)
+    return surface
+
+class LightTextureCache:
+    """Gradient textures built once per (radius, intensity, zoom)"""
+    def __init__(self):
+        self.textures = {}
+
+    def vignette(self, radius, intensity, zoom):
+        """Torch falloff: clear at the center, `intensity` fog at the rim"""
+        key = ('vignette', radius, intensity, zoom)
+        texture = self.textures.get(key)
+        if texture is None:
+            texture = radial_gradient(int(radius * zoom), 0, intensity)
+            self.textures[key] = texture
+        return texture
+
+    def light(self, radius, intensity, zoom):
+        """Hole to MIN-blend into a darkness layer; opaque outside the disc"""
+        key = ('light', radius, intensity, zoom)
+        texture = self.textures.get(key)
+        if texture is None:
+            texture = radial_gradient(int(radius * zoom), 255 - intensity, 255, 255)
+            self.textures[key] = texture
+        return texture
+
+    def clear(self):
+        self.textures.clear()
+
+light_textures = LightTextureCache()
+
+class LightingSystem:
+    """
+    Composites any number of light sources into one darkness layer and
+    lays that over the scene with a single blit. Each light is a
+    (world_pos, radius, intensity) tuple.
+    """
+    def __init__(self, ambient=AMBIENT_DARKNESS, textures=light_textures):
+        self.ambient = ambient
+        self.textures = textures
+        self.darkness = None
+
+    def render(self, screen, camera, lights):
+        if self.darkness is None or self.darkness.get_size() != screen.get_size():
+            self.darkness = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.darkness.fill((*FOG_COLOR, self.ambient))
+
+        width, height = screen.get_size()
+        blits = []
+        for pos, radius, intensity in lights:
+            texture = self.textures.light(radius, intensity, camera.zoom)
+            half = texture.get_width() // 2
+            x, y = camera.apply_pos(pos)
+            if -half < x < width + half and -half < y < height + half:
+                blits.append((texture, (x - half, y - half), None, pygame.BLEND_RGBA_MIN))
+        self.darkness.blits(blits, doreturn=False)
+
+        screen.blit(self.darkness, (0, 0))
@@ -1,5 +1,7 @@
 import pygame
-import os
+from assets import assets
+
+_loaded = {}  # path -> (sheet, sprite data) for the last decoded version
 
 def load_character_sheet(sheet_path):
     """
@@ -10,10 +12,10 @@ def load_character_sheet(sheet_path):
     Row 2 → right
     Row 3 → up
     """
-    if not os.path.exists(sheet_path):
-        raise FileNotFoundError(f"Sprite sheet not found: {sheet_path}")
-
-    sheet = pygame.image.load(sheet_path).convert_alpha()
+    sheet = assets.sheet(sheet_path)  # Decoded once per file version
+    cached = _loaded.get(sheet_path)
+    if cached and cached[0] is sheet:
+        return cached[1]
     sheet_width, sheet_height = sheet.get_size()
 
     COLS = 4
@@ -45,9 +47,15 @@ def load_character_sheet(sheet_path):
             row_frames.append(frame)
         frames[name] = row_frames
 
-    return {
+    flipped_frames = {
+        name: [pygame.transform.flip(frame, True, False) for frame in row_frames]
+        for name, row_frames in frames.items()
+    }
+
+    sprite_data = {
         "sheet": sheet,
         "frames": frames,
+        "flipped_frames": flipped_frames,
         "metadata": {
             "frame_size": FRAME_SIZE,
             "grid": (COLS, ROWS),
@@ -55,3 +63,17 @@ def load_character_sheet(sheet_path):
             "anchor_point": (FRAME_WIDTH // 2, int(FRAME_HEIGHT * 0.9))
         }
     }
+    _loaded[sheet_path] = (sheet, sprite_data)
+    return sprite_data
+
+def clear_cache():
+    """Drop every decoded sheet, so the next load reads the file again"""
+    assets.clear()
+    _loaded.clear()
+
+def slice_sprite_sheet(path, columns, rows, resize_to=None):
+    """
+    Rows of frames from a columns x rows grid sheet, each scaled to
+    resize_to (w, h) if given. Frames are cached, so repeat calls are free.
+    """
+    return assets.frames(path, columns, rows, resize_to)
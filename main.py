@@ -1,8 +1,19 @@
+import time
+STARTED = time.perf_counter()  # Before the other imports so --measure-startup counts them
+
+import argparse
 import pygame
+import random
 import sys
-from maze import Maze
+from level_manager import LevelManager
+from level_pipeline import LevelPipeline
 from player import Player, PlayerState  # Added PlayerState import
 from camera import Camera
+from fog import FogOfWar, SparseFog
+from lighting import LightingSystem
+from text_cache import TextCache, DirtyText
+from profiler import profiler
+from timestep import FixedTimestep, SimClock, WallClock
 from utils.settings import *
 from enum import Enum
 
@@ -13,50 +24,146 @@ class GameState(Enum):
 
 class Game:
     def __init__(self):
-        pygame.init()
+        self.startup = [("imports", time.perf_counter())]  # (phase, time it finished)
+        self.time_source = WallClock()  # pygame.time only ticks after a full pygame.init()
+        self.sim_clock = SimClock()  # Game time: advances step_ms per tick, stops when ticks are dropped
+        self.maze_options = {}
+        self.seed = MAZE_SEED if MAZE_SEED is not None else random.randrange(2**32)
+        # A random seed never comes back in a later run, so its layouts aren't worth a file
+        self.maze_cache_dir = MAZE_CACHE_DIR if MAZE_SEED is not None else None
+        self.maze = None
+        
+        # Start building the first maze in the background while the window comes up
+        self.levels = LevelManager(LevelPipeline(self.seed, clock=self.sim_clock,
+                                                 cache_dir=self.maze_cache_dir, **self.maze_options))
+        if not WORLD_MODE:
+            self.levels.pipeline.prefetch(self.levels.level)
+        self.mark_startup("maze queued")
+        
+        # Only the subsystems the game uses; no audio or joystick
+        pygame.display.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Horror Maze")
-        self.clock = pygame.time.Clock()
+        self.mark_startup("display")
         
+        # Fonts themselves load on first use through the registry
+        pygame.font.init()
+        self.text = TextCache()
+        self.timer_text = DirtyText(self.text.fonts, "Time: {}s", 36, (255, 255, 255))
+        self.mark_startup("fonts")
+        
+        self.clock = pygame.time.Clock()
+        self.lighting = LightingSystem() if AMBIENT_DARKNESS else None
+        self.timestep = FixedTimestep()
         self.reset_game()
+        self.mark_startup("maze ready")
+        
+    def mark_startup(self, phase):
+        self.startup.append((phase, time.perf_counter()))
+        
+    def report_startup(self):
+        """Print how long each startup phase took, from process start to now"""
+        previous = STARTED
+        for phase, finished in self.startup:
+            print(f"{phase:<12}{(finished - previous) * 1000:8.1f} ms")
+            previous = finished
+        print(f"{'total':<12}{(previous - STARTED) * 1000:8.1f} ms")
         
     def reset_game(self):
-        self.maze = Maze()
+        if WORLD_MODE:
+            # Chunks are generated as the player reaches them
+            from world import World
+            if self.maze:
+                self.maze.close()
+            self.maze = World(self.levels.pipeline.seed_for(self.levels.level), clock=self.sim_clock)
+        else:
+            # Later levels are built in the background; restarts reload the cached layout
+            self.maze = self.levels.current_maze()
         self.camera = Camera()
         
         # Start player at maze start position
         start_x, start_y = self.maze.start_pos
         start_px = start_x * CELL_SIZE + (CELL_SIZE - PATH_WIDTH)//2
         start_py = start_y * CELL_SIZE + (CELL_SIZE - PATH_WIDTH)//2
-        self.player = Player(start_px, start_py)
+        self.player = Player(start_px, start_py, clock=self.sim_clock)
         
-        self.visited_cells = set()
+        if WORLD_MODE:
+            self.fog = self.maze.fog = SparseFog(self.maze.cols, self.maze.rows, self.maze.chunk_size,
+                                                 visibility=self.maze.visibility)
+        else:
+            self.fog = FogOfWar(self.maze.cols, self.maze.rows, visibility=self.maze.visibility)
+        self.last_frame = None  # What the screen shows, for dirty-rect mode
         self.update_visited_cells()
         self.state = GameState.RUNNING
         self.game_time = 0
+        self.remember_view()
         
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+                elif event.key == pygame.K_F4:
+                    profiler.dump(PROFILER_DUMP)
                 elif self.state != GameState.RUNNING and event.key == pygame.K_r:
+                    if self.state == GameState.VICTORY:
+                        self.levels.advance()
                     self.reset_game()
                 
+    def close(self):
+        """Stop the level pipeline and drop the world's paged-out chunks"""
+        self.levels.close()
+        if WORLD_MODE:
+            self.maze.close()
+        
+    def quit(self):
+        self.close()
+        pygame.quit()
+        sys.exit()
+                
     def update(self):
         if self.state != GameState.RUNNING:
             return
             
-        self.game_time += self.clock.get_time()
+        # Fixed-rate ticks however long the frame took; draw() interpolates
         keys = pygame.key.get_pressed()
+        for _ in range(self.timestep.advance(self.clock.get_time())):
+            self.remember_view()
+            self.step(keys, self.timestep.step_ms)
+            if self.state != GameState.RUNNING:
+                break
+        
+    def remember_view(self):
+        """Keep the player and camera positions of the last tick for interpolation"""
+        self.previous_view = (self.player.rect.topleft, tuple(self.camera.display_offset))
+        
+    def interpolated_view(self, alpha):
+        """Player rect and camera offset `alpha` of the way from the last tick to this one"""
+        (px, py), (ox, oy) = self.previous_view
+        rect = self.player.rect
+        offset = self.camera.display_offset
+        if abs(rect.x - px) + abs(rect.y - py) > CELL_SIZE:
+            return rect, offset  # Teleported; don't slide across the maze
+        return (
+            pygame.Rect(round(px + (rect.x - px) * alpha), round(py + (rect.y - py) * alpha),
+                        rect.width, rect.height),
+            pygame.Vector2(round(ox + (offset.x - ox) * alpha), round(oy + (offset.y - oy) * alpha)),
+        )
+        
+    def step(self, keys, dt):
+        """Advance the simulation by one frame of `dt` ms with `keys` held"""
+        self.sim_clock.advance(dt)
+        self.game_time += dt
         self.player.handle_input(keys)
-        self.player.move(self.maze)
+        with profiler.scope("player.move"):
+            self.player.move(self.maze, dt)
         self.player.update_state()
-        self.update_visited_cells()
+        with profiler.scope("visited_cells"):
+            self.update_visited_cells()
         self.camera.follow(self.player)
         
         # Check for special cell effects
@@ -65,79 +172,170 @@ class Game:
             if cell_effect == "trap":
                 self.player.take_damage(20)
                 self.player.state = PlayerState.TRAPPED
-                self.player.state_timer = pygame.time.get_ticks()
+                self.player.state_timer = self.sim_clock.get_ticks()
                 
             elif isinstance(cell_effect, tuple) and cell_effect[0] == "teleport":
                 self.player.state = PlayerState.TELEPORTING
-                self.player.state_timer = pygame.time.get_ticks()
+                self.player.state_timer = self.sim_clock.get_ticks()
                 tele_x, tele_y = cell_effect[1]
                 self.player.rect.x = tele_x * CELL_SIZE + (CELL_SIZE - PATH_WIDTH)//2
                 self.player.rect.y = tele_y * CELL_SIZE + (CELL_SIZE - PATH_WIDTH)//2
                 
             elif cell_effect == "maze_reset":
-                pass  # Maze already reset by check_special_cells
+                # Maze already reset by check_special_cells; new walls, new sight lines
+                self.fog.refresh()
                 
             elif cell_effect == "exit":
                 self.state = GameState.VICTORY
         
         # Update enemies
-        self.maze.update_enemies(
-            (self.player.rect.centerx, self.player.rect.centery),
-            self.player.direction,
-            self.player.light_on
-        )
+        with profiler.scope("update_enemies"):
+            self.maze.update_enemies(
+                (self.player.rect.centerx, self.player.rect.centery),
+                self.player.direction,
+                self.player.light_on,
+                dt
+            )
         
         # Check for enemy collisions
         player_cell_x = self.player.rect.centerx // CELL_SIZE
         player_cell_y = self.player.rect.centery // CELL_SIZE
         
-        for enemy in self.maze.enemies:
-            if (enemy.x == player_cell_x and enemy.y == player_cell_y and 
-                not self.player.light_on):
+        for enemy in self.maze.enemy_index.in_cell(player_cell_x, player_cell_y):
+            if not self.player.light_on:
                 if self.player.take_damage(30):
                     pass
                 if self.player.health <= 0:
                     self.state = GameState.GAME_OVER
     
     def update_visited_cells(self):
+        # Only does work on the frame the player enters a new cell
         cell_x = self.player.rect.centerx // CELL_SIZE
         cell_y = self.player.rect.centery // CELL_SIZE
+        self.fog.update(cell_x, cell_y)
+        self.trim_fog()
         
-        for dx in range(-VISIBLE_RADIUS, VISIBLE_RADIUS+1):
-            for dy in range(-VISIBLE_RADIUS, VISIBLE_RADIUS+1):
-                if (0 <= cell_x + dx < self.maze.cols and 
-                    0 <= cell_y + dy < self.maze.rows):
-                    self.visited_cells.add((cell_x + dx, cell_y + dy))
+    def trim_fog(self):
+        """Drop revealed cells that the dirty rects and the chunk cache have both read"""
+        offsets = [len(self.fog)]
+        if self.last_frame and 'fog' in self.last_frame:
+            offsets.append(self.last_frame['fog'])
+        tile_cache = self.maze.tile_cache
+        if tile_cache and tile_cache.fog is self.fog:
+            offsets.append(tile_cache.fog_seen)
+        self.fog.trim(min(offsets))
         
     def draw(self):
+        # Render between the last two ticks so motion stays smooth at any FPS
+        rect, offset = self.player.rect, self.camera.display_offset
+        self.player.rect, self.camera.display_offset = self.interpolated_view(self.timestep.alpha)
+        try:
+            self.present()
+        finally:
+            self.player.rect, self.camera.display_offset = rect, offset
+        
+    def present(self):
+        if not DIRTY_RECTS:
+            self.render()
+            pygame.display.flip()
+            return
+        
+        rects = self.dirty_rects()
+        if rects is None:
+            self.render()
+            pygame.display.flip()
+        elif rects:
+            # Redraw only inside the changed area and present just those rects
+            self.screen.set_clip(rects[0].unionall(rects[1:]))
+            self.render()
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+        # No changes: skip the frame entirely
+        
+    def dirty_rects(self):
+        """Screen rects changed since the last drawn frame, or None if all of it did"""
+        if self.state == GameState.RUNNING:
+            camera = self.camera
+            player = self.player
+            center = camera.apply_pos(player.rect.center)
+            reach = (PLAYER_SIZE + 4) * camera.zoom  # Body, direction dot and battery bar
+            if player.light_on:
+                reach = max(reach, LIGHT_RADIUS * camera.zoom + 1)  # The torch moves with the player
+            battery = int((30 * camera.zoom - 2) * player.torch_battery / 100), player.torch_battery > 30
+            frame = {
+                # Any change here touches the whole screen
+                'view': (self.state, self.maze, tuple(camera.display_offset), camera.zoom,
+                         player.light_on, player.state, self.maze.reset_time),
+                'player': (pygame.Rect(center[0] - reach, center[1] - reach, 2 * reach, 2 * reach),
+                           tuple(player.direction), battery),
+                'health': player.health,
+                'time': int(self.game_time // 1000),
+                'fog': len(self.fog),
+                'enemies': [pygame.Rect(pos, surface.get_size()) for surface, pos in
+                            self.maze.enemy_blits(camera, player.direction, player.rect.center)],
+            }
+        else:
+            frame = {'view': (self.state, self.game_time)}  # End screens never change
+        
+        previous, self.last_frame = self.last_frame, frame
+        if previous is None or previous['view'] != frame['view'] or profiler.enabled:
+            return None
+        if self.state != GameState.RUNNING:
+            return []
+        
+        rects = []
+        if frame['player'] != previous['player']:
+            rects += [previous['player'][0], frame['player'][0]]
+        if frame['enemies'] != previous['enemies']:
+            rects += previous['enemies'] + frame['enemies']
+        if frame['health'] != previous['health']:
+            rects.append(pygame.Rect(20, 20, 200, 20))
+        if frame['time'] != previous['time']:
+            rects.append(pygame.Rect(SCREEN_WIDTH - 150, 20, 150, 40))
+        if frame['fog'] != previous['fog']:
+            cells, _ = self.fog.revealed_since(previous['fog'])
+            rects += [self.camera.apply(pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+                      for x, y in cells]
+        return [rect.clip(self.screen.get_rect()) for rect in rects]
+        
+    def render(self):
         self.screen.fill(FOG_COLOR)
         
         if self.state == GameState.RUNNING:
             # Draw visited maze areas
-            self.maze.draw(
-                self.screen, 
-                self.camera, 
-                self.visited_cells,
-                self.player.direction,
-                (self.player.rect.centerx, self.player.rect.centery)
-            )
+            with profiler.scope("maze.draw"):
+                self.maze.draw(
+                    self.screen, 
+                    self.camera, 
+                    self.fog,
+                    self.player.direction,
+                    (self.player.rect.centerx, self.player.rect.centery)
+                )
             
             # Draw player
             self.player.draw(self.screen, self.camera)
             
             # Apply lighting effect if light is on
-            if self.player.light_on:
-                self.player.draw_light(self.screen, self.camera)
+            with profiler.scope("lighting"):
+                if self.lighting:
+                    lights = self.maze.light_sources(self.fog)
+                    if self.player.light_on:
+                        lights.append(self.player.light_source())
+                    self.lighting.render(self.screen, self.camera, lights)
+                elif self.player.light_on:
+                    self.player.draw_light(self.screen, self.camera)
             
             # Draw HUD
-            self.draw_hud()
+            with profiler.scope("hud"):
+                self.draw_hud()
             
         elif self.state == GameState.GAME_OVER:
             self.draw_game_over()
         elif self.state == GameState.VICTORY:
             self.draw_victory()
         
-        pygame.display.flip()
+        if profiler.enabled:
+            profiler.draw_overlay(self.screen, self.text.fonts, self.time_source.get_ticks())
         
     def draw_hud(self):
         # Health bar
@@ -151,21 +349,16 @@ class Game:
                         (health_pos[0], health_pos[1], health_width * (self.player.health/100), health_height))
         
         # Time
-        font = pygame.font.SysFont(None, 36)
-        time_text = font.render(f"Time: {self.game_time//1000}s", True, (255, 255, 255))
+        time_text = self.timer_text.render(int(self.game_time // 1000))
         self.screen.blit(time_text, (SCREEN_WIDTH - 150, 20))
         
         # Instructions
-        font_small = pygame.font.SysFont(None, 24)
-        light_text = font_small.render("F: Toggle Light", True, (200, 200, 200))
+        light_text = self.text.render("F: Toggle Light", 24, (200, 200, 200))
         self.screen.blit(light_text, (20, SCREEN_HEIGHT - 30))
     
     def draw_game_over(self):
-        font_large = pygame.font.SysFont(None, 72)
-        font_small = pygame.font.SysFont(None, 36)
-        
-        game_over_text = font_large.render("GAME OVER", True, (255, 0, 0))
-        restart_text = font_small.render("Press R to restart", True, (200, 200, 200))
+        game_over_text = self.text.render("GAME OVER", 72, (255, 0, 0))
+        restart_text = self.text.render("Press R to restart", 36, (200, 200, 200))
         
         self.screen.blit(game_over_text, 
                         (SCREEN_WIDTH//2 - game_over_text.get_width()//2, 
@@ -175,12 +368,9 @@ class Game:
                          SCREEN_HEIGHT//2 + 20))
     
     def draw_victory(self):
-        font_large = pygame.font.SysFont(None, 72)
-        font_small = pygame.font.SysFont(None, 36)
-        
-        victory_text = font_large.render("ESCAPED!", True, (0, 255, 0))
-        time_text = font_large.render(f"Time: {self.game_time//1000}s", True, (255, 255, 255))
-        restart_text = font_small.render("Press R to restart", True, (200, 200, 200))
+        victory_text = self.text.render("ESCAPED!", 72, (0, 255, 0))
+        time_text = self.text.render(f"Time: {int(self.game_time // 1000)}s", 72, (255, 255, 255))
+        restart_text = self.text.render("Press R for the next level", 36, (200, 200, 200))
         
         self.screen.blit(victory_text, 
                         (SCREEN_WIDTH//2 - victory_text.get_width()//2, 
@@ -194,11 +384,26 @@ class Game:
         
     def run(self):
         while True:
-            self.handle_events()
-            self.update()
-            self.draw()
+            with profiler.scope("frame"):
+                self.handle_events()
+                with profiler.scope("update"):
+                    self.update()
+                with profiler.scope("draw"):
+                    self.draw()
             self.clock.tick(FPS)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Horror Maze")
+    parser.add_argument("--measure-startup", action="store_true",
+                        help="Draw the first frame, print time per startup phase and exit")
+    args = parser.parse_args()
+    
     game = Game()
-    game.run()
\ No newline at end of file
+    if args.measure_startup:
+        game.draw()
+        game.mark_startup("first frame")
+        game.report_startup()
+        game.close()
+        pygame.quit()
+    else:
+        game.run()
\ No newline at end of file
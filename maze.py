@@ -1,16 +1,14 @@
 import random
-import pygame
 from utils.settings import *
-from enum import Enum
-
-class CellType(Enum):
-    NORMAL = 0
-    TRAP = 1
-    TELEPORT = 2
-    BUTTON = 3
-    EXIT = 4
+from generators import carve_passages, OPPOSITE
+from wall_grid import WallGrid, CellType, DIRECTION_BITS
+from enemy import Enemy
+from spatial_hash import SpatialHash
+from pathfinding import DistanceField, astar
+from visibility import Visibility
 
 class Cell:
+    """Unpacked per-cell record; Maze itself keeps cells in a WallGrid"""
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -21,101 +19,78 @@ class Cell:
         self.triggered = False
         self.visible = False
 
-class Enemy:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.speed = 1
-        self.aggression = 0.5  # 0-1 how aggressive the enemy is
-        self.detection_radius = 3  # cells
-        self.visible = False
-    
-    def move_toward_player(self, player_x, player_y, maze):
-        # Simple AI: move toward player when not in light
-        dx = 1 if player_x > self.x else -1 if player_x < self.x else 0
-        dy = 1 if player_y > self.y else -1 if player_y < self.y else 0
-        
-        # Randomize movement sometimes
-        if random.random() > self.aggression:
-            dx, dy = random.choice([(1,0), (-1,0), (0,1), (0,-1)])
-        
-        # Check if movement is possible
-        if maze.can_move(self.x, self.y, (dx, dy)):
-            self.x += dx
-            self.y += dy
-    
-    def draw(self, screen, camera, player_direction, player_pos):
-        # Only draw if visible and not in player's view direction
-        if not self.visible:
-            return
-            
-        # Calculate if enemy is in player's peripheral vision
-        player_cell_x, player_cell_y = player_pos
-        rel_x, rel_y = self.x - player_cell_x, self.y - player_cell_y
-        dot_product = player_direction.x * rel_x + player_direction.y * rel_y
+class Maze:
+    def __init__(self, algorithm=None, clock=None, trap_density=None, enemy_count=None,
+                 seed=None, cols=None, rows=None, layout=None):
+        self.cols = cols or MAZE_COLS * 2  # Bigger maze
+        self.rows = rows or MAZE_ROWS * 2
+        self.algorithm = algorithm or MAZE_ALGORITHM
+        self._clock = clock  # Anything with get_ticks(); pygame.time if None
+        self.trap_density = TRAP_DENSITY if trap_density is None else trap_density
+        self.enemy_count = ENEMY_COUNT if enemy_count is None else enemy_count
+        self.seed = seed
+        self.rng = random.Random(seed)  # Private so a seed reproduces the layout
+        self.enemies = []
+        self.enemy_store = None
+        self.visible_enemies = []
         
-        # Enemy is more visible when directly in front
-        if dot_product < 0:  # Behind player
-            return
-            
-        # Draw enemy
-        cx = self.x * CELL_SIZE + CELL_SIZE//2
-        cy = self.y * CELL_SIZE + CELL_SIZE//2
-        adjusted_pos = camera.apply_pos((cx, cy))
-        radius = int(CELL_SIZE * 0.3 * camera.zoom)
+        if layout is None:
+            self.grid = self.generate_maze()
+            self.start_pos = (0, 0)
+            self.exit_pos = (self.cols-1, self.rows-1)
+            self.generate_special_cells()
+            enemy_positions = self.generate_enemies()
+        else:
+            # (grid, start_pos, exit_pos, enemy_positions), e.g. from maze_cache
+            self.grid, self.start_pos, self.exit_pos, enemy_positions = layout
         
-        # Fixed alpha calculation line:
-        visibility = 0.3 + 0.7 * dot_product / (abs(rel_x) + abs(rel_y) + 0.1)
-        alpha = min(255, max(50, int(255 * visibility)))
+        # Gameplay randomness gets its own stream so a maze loaded from a
+        # layout behaves exactly like the freshly generated one
+        if seed is not None:
+            self.rng.seed(f"{seed}:play")
+        self.spawn_enemies(enemy_positions)
         
-        enemy_surface = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-        pygame.draw.circle(enemy_surface, (255, 0, 0, alpha), (radius, radius), radius)
-        screen.blit(enemy_surface, (adjusted_pos[0]-radius, adjusted_pos[1]-radius))
-
-class Maze:
-    def __init__(self):
-        self.cols = MAZE_COLS * 2  # Bigger maze
-        self.rows = MAZE_ROWS * 2
-        self.grid = self.generate_maze()
-        self.enemies = []
-        self.start_pos = (0, 0)
-        self.exit_pos = (self.cols-1, self.rows-1)
-        self.generate_special_cells()
-        self.generate_enemies()
         self.reset_time = 0
         self.reset_cooldown = 10000  # ms before maze can reset again
+        self.enemy_step_ms = 1000 / ENEMY_STEP_RATE
+        self.enemy_time = 0.0  # Simulated ms not yet spent on enemy steps
+        self.chunk_cache_enabled = CHUNK_CACHE
+        self.tile_cache = None  # ChunkCache, made on the first draw
+        self._renderer = None  # MazeRenderer, made on the first draw
+        self.distance_field = DistanceField(self, ENEMY_TRACKING_RANGE)
+        self.visibility = Visibility(self)
+        
+    @property
+    def clock(self):
+        # pygame is only imported when something actually needs the time
+        if self._clock is None:
+            import pygame
+            self._clock = pygame.time
+        return self._clock
         
     def generate_maze(self):
-        grid = [[Cell(x, y) for y in range(self.rows)] for x in range(self.cols)]
+        grid = WallGrid(self.cols, self.rows)
         
-        # Prim's algorithm with path width consideration
-        start_x, start_y = random.randint(0, self.cols//4), random.randint(0, self.rows//4)
+        start_x, start_y = self.rng.randint(0, self.cols//4), self.rng.randint(0, self.rows//4)
         self.start_pos = (start_x, start_y)
-        grid[start_x][start_y].visited = True
-        walls = self.get_wall_list(grid[start_x][start_y], grid)
-        
-        while walls:
-            wall = random.choice(walls)
-            walls.remove(wall)
-            
-            x, y = wall[1].x, wall[1].y
-            if not grid[x][y].visited:
-                grid[wall[0].x][wall[0].y].walls[wall[2]] = False
-                grid[x][y].walls[self.opposite_wall(wall[2])] = False
-                grid[x][y].visited = True
-                walls.extend(self.get_wall_list(grid[x][y], grid))
+        self.carve_passages(grid)
                 
         return grid
     
+    def carve_passages(self, grid):
+        """Knock down walls along the passages picked by the maze generator"""
+        for x, y, wall in carve_passages(self.cols, self.rows, self.start_pos, self.algorithm, self.rng):
+            grid.remove_wall(x, y, wall)
+    
     def generate_special_cells(self):
         # Set exit cell
         exit_x, exit_y = self.exit_pos
         self.grid[exit_x][exit_y].type = CellType.EXIT
         
-        # Add traps (5% of cells)
-        trap_count = int(self.cols * self.rows * 0.05)
+        # Add traps (5% of cells by default)
+        trap_count = int(self.cols * self.rows * self.trap_density)
         for _ in range(trap_count):
-            x, y = random.randint(0, self.cols-1), random.randint(0, self.rows-1)
+            x, y = self.rng.randint(0, self.cols-1), self.rng.randint(0, self.rows-1)
             if (x,y) != self.start_pos and (x,y) != self.exit_pos:
                 self.grid[x][y].type = CellType.TRAP
         
@@ -124,7 +99,7 @@ class Maze:
         positions = []
         for _ in range(teleport_count * 2):
             while True:
-                x, y = random.randint(0, self.cols-1), random.randint(0, self.rows-1)
+                x, y = self.rng.randint(0, self.cols-1), self.rng.randint(0, self.rows-1)
                 if (x,y) not in positions and (x,y) != self.start_pos and (x,y) != self.exit_pos:
                     positions.append((x,y))
                     break
@@ -141,107 +116,85 @@ class Maze:
         button_count = 3
         for _ in range(button_count):
             while True:
-                x, y = random.randint(0, self.cols-1), random.randint(0, self.rows-1)
+                x, y = self.rng.randint(0, self.cols-1), self.rng.randint(0, self.rows-1)
                 if (x,y) != self.start_pos and (x,y) != self.exit_pos and self.grid[x][y].type == CellType.NORMAL:
                     self.grid[x][y].type = CellType.BUTTON
                     break
     
     def generate_enemies(self):
-        enemy_count = 5
-        for _ in range(enemy_count):
+        positions = []
+        for _ in range(self.enemy_count):
             while True:
-                x, y = random.randint(0, self.cols-1), random.randint(0, self.rows-1)
+                x, y = self.rng.randint(0, self.cols-1), self.rng.randint(0, self.rows-1)
                 # Ensure enemies aren't too close to start
                 if abs(x - self.start_pos[0]) + abs(y - self.start_pos[1]) > 10:
-                    self.enemies.append(Enemy(x, y))
+                    positions.append((x, y))
                     break
+        return positions
     
-    def opposite_wall(self, wall):
-        return {'top':'bottom', 'bottom':'top', 'left':'right', 'right':'left'}[wall]
+    def spawn_enemies(self, positions):
+        # Big swarms switch to the vectorized store (Enemy views stay in self.enemies)
+        if ENEMY_STORE_THRESHOLD is not None and len(positions) >= ENEMY_STORE_THRESHOLD:
+            from enemy_store import EnemyStore, numpy_available  # Only big swarms load NumPy
+            if numpy_available():
+                self.enemy_store = EnemyStore(positions, seed=self.rng.getrandbits(64))
+        if self.enemy_store:
+            self.enemies = self.enemy_store.views
+        else:
+            self.enemies = [Enemy(x, y) for x, y in positions]
+        self.enemy_index = SpatialHash(self.enemies)
     
-    def get_wall_list(self, cell, grid):
-        walls = []
-        for dx, dy, direction in [(0, -1, 'top'), (1, 0, 'right'), 
-                                 (0, 1, 'bottom'), (-1, 0, 'left')]:
-            nx, ny = cell.x + dx, cell.y + dy
-            if 0 <= nx < self.cols and 0 <= ny < self.rows:
-                walls.append((cell, grid[nx][ny], direction))
-        return walls
+    def opposite_wall(self, wall):
+        return OPPOSITE[wall]
         
-    def draw(self, screen, camera, visited_cells, player_direction, player_pos):
-        current_time = pygame.time.get_ticks()
+    @property
+    def renderer(self):
+        # Drawing code (and pygame) is only imported once something draws
+        if self._renderer is None:
+            from maze_render import MazeRenderer
+            self._renderer = MazeRenderer(self)
+        return self._renderer
         
-        for x in range(self.cols):
-            for y in range(self.rows):
-                if (x, y) not in visited_cells:
-                    continue
-                    
-                cell = self.grid[x][y]
-                cell.visible = True
-                cx = x * CELL_SIZE
-                cy = y * CELL_SIZE
-                
-                # Draw cell background based on type
-                path_rect = pygame.Rect(
-                    cx + (CELL_SIZE - PATH_WIDTH)//2,
-                    cy + (CELL_SIZE - PATH_WIDTH)//2,
-                    PATH_WIDTH,
-                    PATH_WIDTH
-                )
-                
-                if cell.type == CellType.TRAP and cell.triggered:
-                    color = (200, 0, 0)  # Red for triggered trap
-                elif cell.type == CellType.TRAP:
-                    color = (100, 0, 0)  # Dark red for trap
-                elif cell.type == CellType.TELEPORT:
-                    color = (0, 100, 200)  # Blue for teleporter
-                elif cell.type == CellType.BUTTON:
-                    color = (200, 200, 0)  # Yellow for button
-                elif cell.type == CellType.EXIT:
-                    color = (0, 200, 0)  # Green for exit
-                else:
-                    color = (30, 30, 40)  # Default color
-                
-                pygame.draw.rect(screen, color, camera.apply(path_rect))
-                
-                # Draw walls
-                wall_color = (200, 200, 210)
-                if cell.walls['top']:
-                    wall_rect = pygame.Rect(cx, cy, CELL_SIZE, WALL_THICKNESS)
-                    pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
-                if cell.walls['right']:
-                    wall_rect = pygame.Rect(cx + CELL_SIZE - WALL_THICKNESS, cy, 
-                                           WALL_THICKNESS, CELL_SIZE)
-                    pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
-                if cell.walls['bottom']:
-                    wall_rect = pygame.Rect(cx, cy + CELL_SIZE - WALL_THICKNESS, 
-                                           CELL_SIZE, WALL_THICKNESS)
-                    pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
-                if cell.walls['left']:
-                    wall_rect = pygame.Rect(cx, cy, WALL_THICKNESS, CELL_SIZE)
-                    pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
-        
-        # Draw enemies
-        for enemy in self.enemies:
-            enemy.draw(screen, camera, player_direction, player_pos)
+    def draw(self, screen, camera, fog, player_direction, player_pos):
+        self.renderer.draw(screen, camera, fog, player_direction, player_pos)
+    
+    def enemy_blits(self, camera, player_direction, player_pos):
+        """(surface, screen_pos) for every enemy that would be drawn"""
+        return self.renderer.enemy_blits(camera, player_direction, player_pos)
+
+    def draw_enemies(self, screen, camera, player_direction, player_pos):
+        self.renderer.draw_enemies(screen, camera, player_direction, player_pos)
 
+    def draw_cell(self, screen, camera, x, y):
+        """Draw the path background and walls of cell (x,y)"""
+        self.renderer.draw_cell(screen, camera, x, y)
+        
+    def light_sources(self, fog):
+        """Glowing teleporters and exit the player has already found"""
+        cells = [divmod(index, self.rows) for index in self.grid.teleports]
+        cells.append(self.exit_pos)
+        return [
+            ((x * CELL_SIZE + CELL_SIZE//2, y * CELL_SIZE + CELL_SIZE//2), GLOW_RADIUS, GLOW_INTENSITY)
+            for x, y in cells if fog.is_explored(x, y)
+        ]
+        
     def can_move(self, x, y, direction):
         """Check if movement is possible in given direction from cell (x,y)"""
         if not (0 <= x < self.cols and 0 <= y < self.rows):
             return False
             
-        cell = self.grid[x][y]
-        
-        if direction == (-1, 0):  # Left
-            return not cell.walls['left']
-        elif direction == (1, 0):  # Right
-            return not cell.walls['right']
-        elif direction == (0, -1):  # Up
-            return not cell.walls['top']
-        elif direction == (0, 1):  # Down
-            return not cell.walls['bottom']
-            
-        return False
+        bit = DIRECTION_BITS.get(direction)
+        if bit is None:
+            return False
+        return not self.grid.walls[x * self.rows + y] & bit
+    
+    def find_path(self, start, goal, trap_cost=0):
+        """Cell path from start to goal, see pathfinding.astar"""
+        return astar(self, start, goal, trap_cost)
+    
+    def wall_mask(self, x, y):
+        """Packed wall bits of cell (x,y), see wall_grid.WALL_BITS"""
+        return self.grid.walls[x * self.rows + y]
     
     def check_special_cells(self, player_rect):
         """Check if player is on a special cell and trigger effects"""
@@ -255,6 +208,8 @@ class Maze:
         
         if cell.type == CellType.TRAP and not cell.triggered:
             cell.triggered = True
+            if self.tile_cache:
+                self.tile_cache.invalidate_cell(x, y)
             return "trap"  # Player takes damage
         
         elif cell.type == CellType.TELEPORT and not cell.triggered:
@@ -262,7 +217,7 @@ class Maze:
             return "teleport", cell.linked_teleport
         
         elif cell.type == CellType.BUTTON and not cell.triggered:
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.reset_time > self.reset_cooldown:
                 cell.triggered = True
                 self.reset_time = current_time
@@ -276,47 +231,71 @@ class Maze:
     
     def reset_maze(self):
         """Reorganize the maze walls"""
-        # Reset all walls
-        for x in range(self.cols):
-            for y in range(self.rows):
-                self.grid[x][y].walls = {'top': True, 'right': True, 'bottom': True, 'left': True}
-                self.grid[x][y].visited = False
+        self.grid.reset_walls()
         
         # Regenerate maze with same dimensions
-        start_x, start_y = self.start_pos
-        self.grid[start_x][start_y].visited = True
-        walls = self.get_wall_list(self.grid[start_x][start_y], self.grid)
-        
-        while walls:
-            wall = random.choice(walls)
-            walls.remove(wall)
-            
-            x, y = wall[1].x, wall[1].y
-            if not self.grid[x][y].visited:
-                self.grid[wall[0].x][wall[0].y].walls[wall[2]] = False
-                self.grid[x][y].walls[self.opposite_wall(wall[2])] = False
-                self.grid[x][y].visited = True
-                walls.extend(self.get_wall_list(self.grid[x][y], self.grid))
+        self.carve_passages(self.grid)
         
         # Reset triggers but keep cell types
-        for x in range(self.cols):
-            for y in range(self.rows):
-                self.grid[x][y].triggered = False
+        self.grid.clear_triggers()
+        self.distance_field.invalidate()
+        self.visibility.invalidate()
+        if self.tile_cache:
+            self.tile_cache.invalidate_all()
     
-    def update_enemies(self, player_pos, player_direction, player_light_on):
-        """Update enemy positions based on player state"""
+    def update_enemies(self, player_pos, player_direction, player_light_on, dt=None):
+        """
+        Update enemies for `dt` ms of game time: as many steps as
+        ENEMY_STEP_RATE allows, carrying the remainder to the next call.
+        Without dt exactly one step is taken.
+        """
+        if dt is None:
+            self.step_enemies(player_pos, player_direction, player_light_on)
+            return
+        self.enemy_time += dt
+        # The epsilon keeps float drift from skipping a step when the rates match
+        steps = int((self.enemy_time + 1e-6) // self.enemy_step_ms)
+        self.enemy_time = max(0.0, self.enemy_time - steps * self.enemy_step_ms)
+        for _ in range(steps):
+            self.step_enemies(player_pos, player_direction, player_light_on)
+
+    def step_enemies(self, player_pos, player_direction, player_light_on):
+        """Move every enemy one step based on player state"""
         player_x = player_pos[0] // CELL_SIZE
         player_y = player_pos[1] // CELL_SIZE
         
+        # One bounded BFS per player cell change, shared by every enemy
+        self.distance_field.update((player_x, player_y))
+        # Cells the player has a line of sight to; walls hide enemies
+        sight = self.visibility.visible(player_x, player_y, 5)
+        
+        if self.enemy_store:
+            moved = self.enemy_store.update(self, player_x, player_y, player_direction,
+                                            player_light_on, sight)
+            for index in moved:
+                self.enemy_index.sync(self.enemies[index])
+            self.visible_enemies = [self.enemies[i] for i in self.enemy_store.visible_indices()]
+            return
+        
+        # Only enemies near the player can be visible, so only touch those
+        for enemy in self.visible_enemies:
+            enemy.visible = False
+        if player_light_on:
+            # Enemy is visible if in light, in front of player and not behind a wall
+            self.visible_enemies = [
+                enemy for enemy in self.enemy_index.in_view_cone(
+                    player_x, player_y, player_direction, 5, -0.5)
+                if enemy.x * self.rows + enemy.y in sight
+            ]
+        else:
+            self.visible_enemies = []
+        for enemy in self.visible_enemies:
+            enemy.visible = True
+        
         for enemy in self.enemies:
-            # Determine if enemy is visible to player
-            rel_x, rel_y = enemy.x - player_x, enemy.y - player_y
-            distance = (rel_x**2 + rel_y**2)**0.5
-            
-            # Enemy is visible if in light and in front of player
-            dot_product = player_direction.x * rel_x + player_direction.y * rel_y
-            enemy.visible = (distance < 5 and dot_product > -0.5 and player_light_on)
-            
             # Move toward player when not looking directly at them
-            if not enemy.visible or random.random() > 0.8:
-                enemy.move_toward_player(player_x, player_y, self)
\ No newline at end of file
+            if not enemy.visible or self.rng.random() > 0.8:
+                old_x, old_y = enemy.x, enemy.y
+                enemy.move_toward_player(player_x, player_y, self)
+                if (enemy.x, enemy.y) != (old_x, old_y):
+                    self.enemy_index.move(enemy, (enemy.x, enemy.y))
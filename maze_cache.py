@@ -0,0 +1,125 @@
+import os
+import struct
+from generators import GENERATOR_VERSION
+from maze import Maze
+from wall_grid import WallGrid
+from utils.settings import (
+    MAZE_CACHE_DIR, MAZE_CACHE_MAX_FILES, MAZE_COLS, MAZE_ROWS, MAZE_ALGORITHM, TRAP_DENSITY,
+    ENEMY_COUNT
+)
+
+# Layout file: header, then cols*rows wall bytes, cols*rows cell type bytes,
+# teleport links and enemy spawn cells. Trigger state is not stored since a
+# fresh maze starts with everything untriggered.
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sBIIIIII")  # magic, version, cols, rows, start, exit, teleports, enemies
+TELEPORT = struct.Struct("<III")  # cell index, linked x, linked y
+POSITION = struct.Struct("<II")
+
+def dumps(maze):
+    """Serialize the generated layout of a Maze to bytes"""
+    grid = maze.grid
+    start = maze.start_pos[0] * maze.rows + maze.start_pos[1]
+    exit_index = maze.exit_pos[0] * maze.rows + maze.exit_pos[1]
+    enemies = [(enemy.x, enemy.y) for enemy in maze.enemies]
+    parts = [
+        HEADER.pack(MAGIC, VERSION, maze.cols, maze.rows, start, exit_index,
+                    len(grid.teleports), len(enemies)),
+        bytes(grid.walls),
+        bytes(grid.types),
+    ]
+    parts.extend(TELEPORT.pack(index, *target) for index, target in sorted(grid.teleports.items()))
+    parts.extend(POSITION.pack(x, y) for x, y in enemies)
+    return b"".join(parts)
+
+def loads_layout(data):
+    """Parse bytes from dumps() into a (grid, start_pos, exit_pos, enemy_positions) layout"""
+    if len(data) < HEADER.size:
+        raise ValueError("Maze data is truncated")
+    magic, version, cols, rows, start, exit_index, teleports, enemies = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Unsupported maze data: {magic!r} v{version}")
+    size = cols * rows
+    expected = HEADER.size + 2 * size + teleports * TELEPORT.size + enemies * POSITION.size
+    if len(data) != expected:
+        raise ValueError(f"Maze data is {len(data)} bytes, expected {expected}")
+
+    grid = WallGrid(cols, rows)
+    offset = HEADER.size
+    grid.walls[:] = data[offset:offset + size]
+    offset += size
+    grid.types[:] = data[offset:offset + size]
+    offset += size
+    for _ in range(teleports):
+        index, x, y = TELEPORT.unpack_from(data, offset)
+        grid.teleports[index] = (x, y)
+        offset += TELEPORT.size
+    positions = []
+    for _ in range(enemies):
+        positions.append(POSITION.unpack_from(data, offset))
+        offset += POSITION.size
+    return grid, divmod(start, rows), divmod(exit_index, rows), positions
+
+def loads(data, **options):
+    """Rebuild a Maze from dumps() output; options are passed on to Maze"""
+    layout = loads_layout(data)
+    options.update(cols=layout[0].cols, rows=layout[0].rows)
+    return Maze(layout=layout, **options)
+
+def cache_path(cache_dir, seed, cols, rows, algorithm, trap_density, enemy_count):
+    name = f"{algorithm}-g{GENERATOR_VERSION}-{cols}x{rows}-t{trap_density}-e{enemy_count}-{seed}.maze"
+    return os.path.join(cache_dir, name)
+
+def prune(cache_dir, max_files=MAZE_CACHE_MAX_FILES):
+    """Delete the least recently used layouts beyond the newest max_files"""
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".maze")]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[max_files:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass  # Another process got there first
+
+def load_or_build(seed=None, cache_dir=MAZE_CACHE_DIR, clock=None, cols=None, rows=None,
+                  algorithm=None, trap_density=None, enemy_count=None):
+    """
+    Maze for `seed`, read from the on-disk cache when the same layout was
+    built before, otherwise generated and stored. Unseeded mazes, or
+    cache_dir=None, skip the cache. Only pass a cache_dir for seeds a later
+    run can ask for again (a fixed MAZE_SEED); random per-run seeds would
+    just fill it up.
+    """
+    # Resolve defaults the way Maze does so the key names the real layout
+    key = dict(
+        seed=seed,
+        cols=cols or MAZE_COLS * 2,
+        rows=rows or MAZE_ROWS * 2,
+        algorithm=algorithm or MAZE_ALGORITHM,
+        trap_density=TRAP_DENSITY if trap_density is None else trap_density,
+        enemy_count=ENEMY_COUNT if enemy_count is None else enemy_count,
+    )
+    if seed is None or cache_dir is None:
+        return Maze(clock=clock, **key)
+
+    path = cache_path(cache_dir, **key)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                maze = loads(f.read(), clock=clock, **key)
+            os.utime(path)  # Mark it recently used for prune()
+            return maze
+        except (OSError, ValueError, struct.error):
+            pass  # Unreadable or stale entry; rebuild it below
+
+    maze = Maze(clock=clock, **key)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(maze))
+    os.replace(tmp_path, path)
+    prune(cache_dir)
+    return maze
@@ -0,0 +1,122 @@
+import pygame
+from enemy_sprites import enemy_sprites
+from tile_cache import ChunkCache
+from wall_grid import CellType
+from utils.settings import CELL_SIZE, PATH_WIDTH, WALL_THICKNESS
+
+class MazeRenderer:
+    """
+    Drawing for a Maze (cells, enemies and the chunk cache). Maze creates
+    it on the first draw, so headless code never imports pygame.
+    """
+    def __init__(self, maze):
+        self.maze = maze
+
+    def draw(self, screen, camera, fog, player_direction, player_pos):
+        maze = self.maze
+        if maze.chunk_cache_enabled and maze.tile_cache is None:
+            maze.tile_cache = ChunkCache(maze)
+        if maze.tile_cache:
+            maze.tile_cache.draw(screen, camera, fog)
+        else:
+            # Only walk the cells that can actually land on screen
+            x0, x1, y0, y1 = camera.visible_cell_range(maze.cols, maze.rows)
+            explored = fog.explored
+            
+            for x in range(x0, x1):
+                column = x * maze.rows
+                for y in range(y0, y1):
+                    if not explored[column + y]:
+                        continue
+                    self.draw_cell(screen, camera, x, y)
+        
+        self.draw_enemies(screen, camera, player_direction, player_pos)
+    
+    def enemy_blits(self, camera, player_direction, player_pos):
+        """(surface, screen_pos) for every enemy that would be drawn"""
+        player_cell = (player_pos[0] // CELL_SIZE, player_pos[1] // CELL_SIZE)
+        blits = []
+        for enemy in self.maze.visible_enemies:
+            blit = self.enemy_blit(enemy, camera, player_direction, player_cell)
+            if blit:
+                blits.append(blit)
+        return blits
+
+    def enemy_blit(self, enemy, camera, player_direction, player_pos):
+        """(surface, screen_pos) to draw this enemy with, or None when hidden"""
+        # Only draw if visible and not in player's view direction
+        if not enemy.visible:
+            return None
+            
+        # Calculate if enemy is in player's peripheral vision
+        player_cell_x, player_cell_y = player_pos
+        rel_x, rel_y = enemy.x - player_cell_x, enemy.y - player_cell_y
+        dot_product = player_direction.x * rel_x + player_direction.y * rel_y
+        
+        # Enemy is more visible when directly in front
+        if dot_product < 0:  # Behind player
+            return None
+            
+        cx = enemy.x * CELL_SIZE + CELL_SIZE//2
+        cy = enemy.y * CELL_SIZE + CELL_SIZE//2
+        adjusted_pos = camera.apply_pos((cx, cy))
+        radius = int(CELL_SIZE * 0.3 * camera.zoom)
+        
+        visibility = 0.3 + 0.7 * dot_product / (abs(rel_x) + abs(rel_y) + 0.1)
+        alpha = min(255, max(50, int(255 * visibility)))
+        
+        sprite = enemy_sprites.get(radius, alpha)
+        return sprite, (adjusted_pos[0]-radius, adjusted_pos[1]-radius)
+    
+    def draw_enemies(self, screen, camera, player_direction, player_pos):
+        """Draw every visible enemy with one Surface.blits call"""
+        blits = self.enemy_blits(camera, player_direction, player_pos)
+        if blits:
+            screen.blits(blits, doreturn=False)
+
+    def draw_cell(self, screen, camera, x, y):
+        """Draw the path background and walls of cell (x,y)"""
+        cell = self.maze.grid[x][y]
+        cell.visible = True
+        cx = x * CELL_SIZE
+        cy = y * CELL_SIZE
+        
+        # Draw cell background based on type
+        path_rect = pygame.Rect(
+            cx + (CELL_SIZE - PATH_WIDTH)//2,
+            cy + (CELL_SIZE - PATH_WIDTH)//2,
+            PATH_WIDTH,
+            PATH_WIDTH
+        )
+        
+        if cell.type == CellType.TRAP and cell.triggered:
+            color = (200, 0, 0)  # Red for triggered trap
+        elif cell.type == CellType.TRAP:
+            color = (100, 0, 0)  # Dark red for trap
+        elif cell.type == CellType.TELEPORT:
+            color = (0, 100, 200)  # Blue for teleporter
+        elif cell.type == CellType.BUTTON:
+            color = (200, 200, 0)  # Yellow for button
+        elif cell.type == CellType.EXIT:
+            color = (0, 200, 0)  # Green for exit
+        else:
+            color = (30, 30, 40)  # Default color
+        
+        pygame.draw.rect(screen, color, camera.apply(path_rect))
+        
+        # Draw walls
+        wall_color = (200, 200, 210)
+        if cell.walls['top']:
+            wall_rect = pygame.Rect(cx, cy, CELL_SIZE, WALL_THICKNESS)
+            pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
+        if cell.walls['right']:
+            wall_rect = pygame.Rect(cx + CELL_SIZE - WALL_THICKNESS, cy, 
+                                   WALL_THICKNESS, CELL_SIZE)
+            pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
+        if cell.walls['bottom']:
+            wall_rect = pygame.Rect(cx, cy + CELL_SIZE - WALL_THICKNESS, 
+                                   CELL_SIZE, WALL_THICKNESS)
+            pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
+        if cell.walls['left']:
+            wall_rect = pygame.Rect(cx, cy, WALL_THICKNESS, CELL_SIZE)
+            pygame.draw.rect(screen, wall_color, camera.apply(wall_rect))
@@ -0,0 +1,167 @@
+import heapq
+from array import array
+from collections import deque
+from wall_grid import WALL_BITS, CellType
+
+UNREACHED = -1
+
+
+def neighbour_steps(rows):
+    """(wall bit, index delta, (dx, dy)) for each direction in a column-major grid"""
+    return (
+        (WALL_BITS['top'], -1, (0, -1)),
+        (WALL_BITS['right'], rows, (1, 0)),
+        (WALL_BITS['bottom'], 1, (0, 1)),
+        (WALL_BITS['left'], -rows, (-1, 0)),
+    )
+
+
+def bfs_distances(maze, source):
+    """Steps from `source` to every cell through open walls (UNREACHED if cut off)"""
+    rows = maze.rows
+    walls = maze.grid.walls
+    steps = neighbour_steps(rows)
+    dist = array('i', [UNREACHED]) * (maze.cols * rows)
+
+    start = source[0] * rows + source[1]
+    dist[start] = 0
+    queue = deque([start])
+    # The outer border is never carved, so open walls never lead off the grid
+    while queue:
+        i = queue.popleft()
+        d = dist[i] + 1
+        mask = walls[i]
+        for bit, delta, _ in steps:
+            if not mask & bit and dist[i + delta] == UNREACHED:
+                dist[i + delta] = d
+                queue.append(i + delta)
+    return dist
+
+
+def astar(maze, start, goal, trap_cost=0):
+    """
+    Cheapest cell path from start to goal (inclusive) with a Manhattan
+    heuristic. Each step costs 1, plus trap_cost when it enters a trap that
+    hasn't gone off yet.
+    """
+    rows = maze.rows
+    walls = maze.grid.walls
+    types = maze.grid.types
+    triggered = maze.grid.triggered
+    trap = CellType.TRAP.value
+    steps = neighbour_steps(rows)
+    goal_x, goal_y = goal
+    start_i = start[0] * rows + start[1]
+    goal_i = goal_x * rows + goal_y
+
+    came_from = {start_i: None}
+    cost = {start_i: 0}
+    open_heap = [(abs(start[0] - goal_x) + abs(start[1] - goal_y), 0, start_i)]
+    while open_heap:
+        _, g, i = heapq.heappop(open_heap)
+        if i == goal_i:
+            path = []
+            while i is not None:
+                path.append(divmod(i, rows))
+                i = came_from[i]
+            return path[::-1]
+        if g > cost[i]:
+            continue  # Stale heap entry
+
+        mask = walls[i]
+        for bit, delta, _ in steps:
+            n = i + delta
+            if mask & bit:
+                continue
+            step = g + 1
+            if trap_cost and types[n] == trap and not triggered[n]:
+                step += trap_cost
+            if n in cost and cost[n] <= step:
+                continue
+            cost[n] = step
+            came_from[n] = i
+            nx, ny = divmod(n, rows)
+            heapq.heappush(open_heap, (step + abs(nx - goal_x) + abs(ny - goal_y), step, n))
+    return None
+
+
+class DistanceField:
+    """
+    BFS distance field towards one target cell (the player). It is only
+    rebuilt when the target changes cell or the walls change, and any number
+    of agents can follow it downhill for the cost of that single BFS.
+
+    With max_distance set the BFS stops that many steps out, and entries are
+    tagged with a generation number instead of being cleared, so a rebuild
+    costs time proportional to the region it covers rather than the grid.
+    Cells outside the region read as UNREACHED.
+    """
+    def __init__(self, maze, max_distance=None):
+        self.maze = maze
+        self.max_distance = max_distance
+        size = maze.cols * maze.rows
+        self.dist = array('i', [UNREACHED]) * size
+        self.stamp = array('I', [0]) * size  # Generation that wrote dist[i]
+        self.generation = 0
+        self.source = None
+        self.region = 0  # Cells reached by the last rebuild
+
+    def update(self, source):
+        if source == self.source:
+            return
+        self.source = source
+        self.generation += 1
+        self.region = 0
+        x, y = source
+        if 0 <= x < self.maze.cols and 0 <= y < self.maze.rows:
+            self.rebuild(x * self.maze.rows + y)
+
+    def rebuild(self, start):
+        dist, stamp, generation = self.dist, self.stamp, self.generation
+        walls = self.maze.grid.walls
+        steps = neighbour_steps(self.maze.rows)
+        limit = self.max_distance
+
+        dist[start] = 0
+        stamp[start] = generation
+        queue = deque([start])
+        reached = 1
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            if limit is not None and d > limit:
+                continue
+            mask = walls[i]
+            for bit, delta, _ in steps:
+                n = i + delta
+                if not mask & bit and stamp[n] != generation:
+                    dist[n] = d
+                    stamp[n] = generation
+                    queue.append(n)
+                    reached += 1
+        self.region = reached
+
+    def invalidate(self):
+        """Force a rebuild on the next update (call after walls change)"""
+        self.source = None
+
+    def distance(self, x, y):
+        i = x * self.maze.rows + y
+        if self.stamp[i] != self.generation:
+            return UNREACHED
+        return self.dist[i]
+
+    def next_step(self, x, y):
+        """(dx, dy) one step closer to the source, or None if already there or out of range"""
+        i = x * self.maze.rows + y
+        if self.stamp[i] != self.generation:
+            return None
+        d = self.dist[i]
+        if d <= 0:
+            return None
+        mask = self.maze.grid.walls[i]
+        for bit, delta, direction in neighbour_steps(self.maze.rows):
+            n = i + delta
+            if not mask & bit and self.stamp[n] == self.generation and self.dist[n] == d - 1:
+                return direction
+        return None
@@ -1,6 +1,8 @@
 import pygame
 from utils.settings import *
 from enum import Enum
+from lighting import light_textures
+from collision import collides, sweep
 
 class PlayerState(Enum):
     NORMAL = 0
@@ -8,7 +10,7 @@ class PlayerState(Enum):
     TELEPORTING = 2
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None):
         self.rect = pygame.Rect(
             x + (PATH_WIDTH - PLAYER_SIZE)//2,
             y + (PATH_WIDTH - PLAYER_SIZE)//2,
@@ -16,24 +18,19 @@ class Player:
             PLAYER_SIZE
         )
         self.direction = pygame.Vector2(0, -1)
-        self.speed = 4
-        self.light_mask = self.create_light_mask()
+        self.speed = 240  # Pixels per second
+        self.remainder = 0.0  # Sub-pixel distance carried over to the next move
         self.health = 100
         self.state = PlayerState.NORMAL
         self.state_timer = 0
         self.light_on = True
         self.torch_battery = 100
+        self.torch_drain = 6  # Battery % per second while lit
+        self.torch_recharge = 3  # Battery % per second while off
         self.last_damage_time = 0
         self.invulnerable_time = 1000  # ms after taking damage
+        self.clock = clock or pygame.time  # Anything with get_ticks()
     
-    def create_light_mask(self):
-        mask = pygame.Surface((LIGHT_RADIUS*2, LIGHT_RADIUS*2), pygame.SRCALPHA)
-        for radius in range(LIGHT_RADIUS, 0, -1):
-            alpha = int(LIGHT_INTENSITY * (radius/LIGHT_RADIUS))
-            pygame.draw.circle(mask, (*FOG_COLOR, alpha), 
-                             (LIGHT_RADIUS, LIGHT_RADIUS), radius)
-        return mask
-        
     def handle_input(self, keys):
         if self.state != PlayerState.NORMAL:
             return
@@ -51,45 +48,34 @@ class Player:
         if keys[pygame.K_f] and self.torch_battery > 0:
             self.light_on = not self.light_on
         
-    def move(self, maze):
+    def move(self, maze, dt=1000 / SIM_RATE):
+        """Move and drain or recharge the torch for `dt` ms of game time"""
         if self.state != PlayerState.NORMAL:
             return
             
-        new_rect = self.rect.copy()
-        new_rect.x += self.direction.x * self.speed
-        new_rect.y += self.direction.y * self.speed
-        
-        if not self.check_collision(new_rect, maze):
-            self.rect = new_rect
+        # Whole pixels only; the fraction is kept so speed doesn't depend on the tick rate
+        distance = self.speed * dt / 1000 + self.remainder
+        pixels = round(distance)
+        self.remainder = distance - pixels
+        # Swept against the walls, so the player stops flush instead of short
+        x, y, hit = sweep(maze, self.rect, self.direction.x * pixels, self.direction.y * pixels)
+        self.rect.topleft = (x, y)
+        if hit:
+            self.remainder = 0.0
         
         # Update torch battery
         if self.light_on:
-            self.torch_battery = max(0, self.torch_battery - 0.1)
+            self.torch_battery = max(0, self.torch_battery - self.torch_drain * dt / 1000)
             if self.torch_battery <= 0:
                 self.light_on = False
         else:
-            self.torch_battery = min(100, self.torch_battery + 0.05)
+            self.torch_battery = min(100, self.torch_battery + self.torch_recharge * dt / 1000)
             
     def check_collision(self, rect, maze):
-        grid_x = rect.centerx // CELL_SIZE
-        grid_y = rect.centery // CELL_SIZE
-        
-        if not (0 <= grid_x < maze.cols and 0 <= grid_y < maze.rows):
-            return True
-            
-        cell = maze.grid[grid_x][grid_y]
-        
-        margin = (CELL_SIZE - PATH_WIDTH)//2
-        if (cell.walls['left'] and rect.left < grid_x * CELL_SIZE + margin) or \
-           (cell.walls['right'] and rect.right > (grid_x+1) * CELL_SIZE - margin) or \
-           (cell.walls['top'] and rect.top < grid_y * CELL_SIZE + margin) or \
-           (cell.walls['bottom'] and rect.bottom > (grid_y+1) * CELL_SIZE - margin):
-            return True
-            
-        return False
+        return collides(maze, rect.x, rect.y, rect.width, rect.height)
         
     def take_damage(self, amount):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if current_time - self.last_damage_time > self.invulnerable_time:
             self.health = max(0, self.health - amount)
             self.last_damage_time = current_time
@@ -97,7 +83,7 @@ class Player:
         return False
         
     def update_state(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         if self.state == PlayerState.TRAPPED and current_time - self.state_timer > 1000:
             self.state = PlayerState.NORMAL
         elif self.state == PlayerState.TELEPORTING and current_time - self.state_timer > 500:
@@ -140,6 +126,10 @@ class Player:
         pygame.draw.rect(screen, battery_color,
                         (battery_pos[0]+1, battery_pos[1]+1, fill_width, battery_height-2))
         
+    def light_source(self):
+        """Torch as a (world_pos, radius, intensity) light for LightingSystem"""
+        return self.rect.center, LIGHT_RADIUS, LIGHT_INTENSITY
+        
     def draw_light(self, screen, camera):
         if not self.light_on:
             return
@@ -149,8 +139,5 @@ class Player:
             adjusted_pos[0] - LIGHT_RADIUS * camera.zoom,
             adjusted_pos[1] - LIGHT_RADIUS * camera.zoom
         )
-        scaled_light = pygame.transform.scale(
-            self.light_mask,
-            (int(LIGHT_RADIUS*2 * camera.zoom), int(LIGHT_RADIUS*2 * camera.zoom))
-        )
-        screen.blit(scaled_light, light_pos)
\ No newline at end of file
+        light_mask = light_textures.vignette(LIGHT_RADIUS, LIGHT_INTENSITY, camera.zoom)
+        screen.blit(light_mask, light_pos)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import csv
+import json
+import time
+from collections import deque
+from utils.settings import PROFILER_ENABLED, PROFILER_WINDOW, PROFILER_OVERLAY_REFRESH
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SCOPE = _NullScope()
+
+class _Scope:
+    """Times one `with` block and records it under `name`"""
+    def __init__(self, samples):
+        self.samples = samples
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append((time.perf_counter() - self.start) * 1000)
+        return False
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+class Profiler:
+    """
+    Named timing scopes with a rolling window of the last `window` samples
+    each. While disabled, scope() hands back a shared no-op context so the
+    instrumented call sites cost one attribute check.
+    """
+    def __init__(self, window=PROFILER_WINDOW, enabled=PROFILER_ENABLED):
+        self.window = window
+        self.enabled = enabled
+        self.samples = {}  # name -> deque of ms
+        self.scopes = {}  # name -> reusable _Scope
+        self.overlay = []  # Rendered overlay lines
+        self.overlay_time = None
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            samples = self.samples.setdefault(name, deque(maxlen=self.window))
+            scope = self.scopes[name] = _Scope(samples)
+        return scope
+
+    def record(self, name, ms):
+        if self.enabled:
+            self.samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.overlay_time = None
+
+    def reset(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    def stats(self):
+        """{name: {count, mean, p50, p95, p99, max}} in ms over the current window"""
+        stats = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats[name] = {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered),
+                'p50': percentile(ordered, 50),
+                'p95': percentile(ordered, 95),
+                'p99': percentile(ordered, 99),
+                'max': ordered[-1],
+            }
+        return stats
+
+    def dump(self, path):
+        """Write stats() to `path` as CSV when it ends in .csv, JSON otherwise"""
+        stats = self.stats()
+        with open(path, "w", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.writer(f)
+                writer.writerow(['scope', 'count', 'mean', 'p50', 'p95', 'p99', 'max'])
+                for name, row in stats.items():
+                    writer.writerow([name] + [row[key] for key in
+                                              ('count', 'mean', 'p50', 'p95', 'p99', 'max')])
+            else:
+                json.dump(stats, f, indent=2)
+
+    def draw_overlay(self, screen, fonts, now, pos=(20, 50)):
+        """Draw the per-scope percentiles, re-rendered every PROFILER_OVERLAY_REFRESH ms"""
+        if self.overlay_time is None or now - self.overlay_time >= PROFILER_OVERLAY_REFRESH:
+            self.overlay_time = now
+            font = fonts.get(20, "monospace")
+            lines = ["scope             p50    p95    p99  (ms)"]
+            for name, row in sorted(self.stats().items()):
+                lines.append(f"{name:<16}{row['p50']:6.2f} {row['p95']:6.2f} {row['p99']:6.2f}")
+            self.overlay = [font.render(line, True, (255, 255, 0), (0, 0, 0)) for line in lines]
+
+        x, y = pos
+        for surface in self.overlay:
+            screen.blit(surface, (x, y))
+            y += surface.get_height()
+
+profiler = Profiler()
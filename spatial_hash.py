@@ -0,0 +1,71 @@
+class SpatialHash:
+    """
+    Uniform grid index of enemies keyed by their cell. Call move() (or
+    sync()) whenever an enemy changes cell; queries then only look at the
+    buckets around the point of interest.
+    """
+    def __init__(self, enemies=()):
+        self.buckets = {}  # (x, y) -> list of enemies in that cell
+        self.cells = {}  # enemy -> (x, y) it is filed under
+        for enemy in enemies:
+            self.insert(enemy)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def insert(self, enemy):
+        cell = (enemy.x, enemy.y)
+        self.buckets.setdefault(cell, []).append(enemy)
+        self.cells[enemy] = cell
+
+    def remove(self, enemy):
+        cell = self.cells.pop(enemy)
+        bucket = self.buckets[cell]
+        bucket.remove(enemy)
+        if not bucket:
+            del self.buckets[cell]
+
+    def move(self, enemy, new_cell):
+        old_cell = self.cells[enemy]
+        if old_cell == new_cell:
+            return
+        bucket = self.buckets[old_cell]
+        bucket.remove(enemy)
+        if not bucket:
+            del self.buckets[old_cell]
+        self.buckets.setdefault(new_cell, []).append(enemy)
+        self.cells[enemy] = new_cell
+
+    def sync(self, enemy):
+        """Re-file an enemy after its x/y were changed directly"""
+        self.move(enemy, (enemy.x, enemy.y))
+
+    def in_cell(self, x, y):
+        return self.buckets.get((x, y), ())
+
+    def within_radius(self, x, y, radius):
+        """Enemies whose cell is closer than `radius` cells to (x, y)"""
+        reach = int(radius)
+        if (2 * reach + 1) ** 2 > len(self.buckets):
+            # Scanning the occupied cells is cheaper than the square around (x, y)
+            cells = self.buckets.items()
+        else:
+            cells = (
+                ((cx, cy), self.buckets[(cx, cy)])
+                for cx in range(x - reach, x + reach + 1)
+                for cy in range(y - reach, y + reach + 1)
+                if (cx, cy) in self.buckets
+            )
+        limit = radius * radius
+        found = []
+        for (cx, cy), bucket in cells:
+            if (cx - x) ** 2 + (cy - y) ** 2 < limit:
+                found.extend(bucket)
+        return found
+
+    def in_view_cone(self, x, y, direction, radius, min_dot):
+        """Enemies within `radius` whose offset dotted with `direction` exceeds min_dot"""
+        return [
+            enemy for enemy in self.within_radius(x, y, radius)
+            if direction.x * (enemy.x - x) + direction.y * (enemy.y - y) > min_dot
+        ]
@@ -0,0 +1,58 @@
+import pygame
+from collections import OrderedDict
+from utils.settings import TEXT_CACHE_SIZE
+
+class FontRegistry:
+    """Loads each (name, size) font once"""
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self.fonts[key] = font
+        return font
+
+class TextCache:
+    """LRU of rendered text surfaces keyed by (text, font, color)"""
+    def __init__(self, fonts=None, max_entries=TEXT_CACHE_SIZE):
+        self.fonts = fonts or FontRegistry()
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, text, size, color, font_name=None):
+        key = (text, font_name, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = self.fonts.get(size, font_name).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+class DirtyText:
+    """
+    Text built from a template that is only re-rendered when its value
+    changes, e.g. DirtyText(fonts, "Time: {}s", 36, (255, 255, 255)).
+    Bypasses the LRU so ticking counters don't push out static strings.
+    """
+    def __init__(self, fonts, template, size, color, font_name=None):
+        self.fonts = fonts
+        self.template = template
+        self.size = size
+        self.color = color
+        self.font_name = font_name
+        self.value = None
+        self.surface = None
+
+    def render(self, value):
+        if self.surface is None or value != self.value:
+            self.value = value
+            font = self.fonts.get(self.size, self.font_name)
+            self.surface = font.render(self.template.format(value), True, self.color)
+        return self.surface
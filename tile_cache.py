@@ -0,0 +1,108 @@
+import math
+import pygame
+from collections import OrderedDict
+from utils.settings import CELL_SIZE, FOG_COLOR, CHUNK_SIZE, CHUNK_CACHE_BUDGET
+
+class ChunkCamera:
+    """Camera stand-in that maps world coordinates into one chunk surface"""
+    def __init__(self, origin, zoom):
+        self.display_offset = pygame.Vector2(origin)
+        self.zoom = zoom
+
+    def apply(self, rect):
+        return pygame.Rect(
+            (rect.x - self.display_offset.x) * self.zoom,
+            (rect.y - self.display_offset.y) * self.zoom,
+            rect.width * self.zoom,
+            rect.height * self.zoom
+        )
+
+class ChunkCache:
+    """
+    Pre-rendered surfaces for CHUNK_SIZE x CHUNK_SIZE blocks of explored
+    cells. Chunks are re-rendered only after being invalidated and the least
+    recently drawn ones are dropped once the cache exceeds its byte budget.
+    """
+    def __init__(self, maze, chunk_size=CHUNK_SIZE, budget=CHUNK_CACHE_BUDGET):
+        self.maze = maze
+        self.chunk_size = chunk_size
+        self.budget = budget
+        self.chunks = OrderedDict()  # (chunk_x, chunk_y) -> Surface
+        self.zoom = None
+        self.chunk_bytes = 0
+        self.fog = None
+        self.fog_seen = 0  # How much of fog.revealed has been applied
+
+    def invalidate_cell(self, x, y):
+        self.chunks.pop((x // self.chunk_size, y // self.chunk_size), None)
+
+    def invalidate_all(self):
+        self.chunks.clear()
+
+    def memory_used(self):
+        return len(self.chunks) * self.chunk_bytes
+
+    def apply_fog(self, fog):
+        """Invalidate the chunks holding cells revealed since the last call"""
+        if fog is not self.fog:
+            self.fog = fog
+            self.fog_seen = 0
+            self.chunks.clear()
+        cells, self.fog_seen = fog.revealed_since(self.fog_seen)
+        for x, y in cells:
+            self.invalidate_cell(x, y)
+
+    def draw(self, screen, camera, fog):
+        self.apply_fog(fog)
+        if camera.zoom != self.zoom:
+            # Chunks are rendered at screen scale, so a new zoom starts over
+            self.chunks.clear()
+            self.zoom = camera.zoom
+            side = math.ceil(self.chunk_size * CELL_SIZE * self.zoom)
+            self.chunk_bytes = side * side * 4
+
+        x0, x1, y0, y1 = camera.visible_cell_range(self.maze.cols, self.maze.rows)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        size = self.chunk_size
+        chunk_span = size * CELL_SIZE
+        blits = []
+        for chunk_x in range(x0 // size, (x1 - 1) // size + 1):
+            for chunk_y in range(y0 // size, (y1 - 1) // size + 1):
+                surface = self.get_chunk(chunk_x, chunk_y, fog)
+                pos = camera.apply_pos((chunk_x * chunk_span, chunk_y * chunk_span))
+                blits.append((surface, pos))
+        screen.blits(blits, doreturn=False)
+
+    def get_chunk(self, chunk_x, chunk_y, fog):
+        key = (chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+
+        surface = self.render_chunk(chunk_x, chunk_y, fog)
+        self.chunks[key] = surface
+
+        # Evict least recently used chunks, but never the one just built
+        while len(self.chunks) > 1 and self.memory_used() > self.budget:
+            self.chunks.popitem(last=False)
+        return surface
+
+    def render_chunk(self, chunk_x, chunk_y, fog):
+        size = self.chunk_size
+        side = math.ceil(size * CELL_SIZE * self.zoom)
+        surface = pygame.Surface((side, side))
+        surface.fill(FOG_COLOR)
+
+        origin = (chunk_x * size * CELL_SIZE, chunk_y * size * CELL_SIZE)
+        chunk_camera = ChunkCamera(origin, self.zoom)
+        explored = fog.explored
+        draw_cell = self.maze.renderer.draw_cell
+        for x in range(chunk_x * size, min(self.maze.cols, (chunk_x + 1) * size)):
+            column = x * self.maze.rows
+            for y in range(chunk_y * size, min(self.maze.rows, (chunk_y + 1) * size)):
+                if explored[column + y]:
+                    draw_cell(surface, chunk_camera, x, y)
+        return surface
@@ -0,0 +1,57 @@
+import time
+from utils.settings import SIM_RATE, MAX_CATCH_UP_STEPS
+
+class WallClock:
+    """
+    Milliseconds since creation, like pygame.time.get_ticks() but without
+    needing pygame.init() to have started SDL's timer subsystem
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    def get_ticks(self):
+        return int((time.perf_counter() - self.start) * 1000)
+
+class SimClock:
+    """Manually advanced stand-in for pygame.time (get_ticks in ms)"""
+    def __init__(self, start=0):
+        self.ticks = start
+
+    def get_ticks(self):
+        return self.ticks
+
+    def advance(self, ms):
+        self.ticks += ms
+
+class FixedTimestep:
+    """
+    Accumulator that turns variable frame times into a whole number of
+    fixed simulation ticks. Leftover time is exposed as `alpha` (0-1) so
+    rendering can interpolate between the last two ticks. At most
+    `max_catch_up` ticks run per frame; beyond that the backlog is dropped
+    so a slow frame can't snowball into ever longer ones.
+    """
+    def __init__(self, rate=SIM_RATE, max_catch_up=MAX_CATCH_UP_STEPS):
+        self.step_ms = 1000 / rate
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0  # Real time skipped by the catch-up guard
+
+    def advance(self, elapsed_ms):
+        """Number of ticks to simulate for `elapsed_ms` of real time"""
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_catch_up:
+            remainder = self.accumulator % self.step_ms
+            self.dropped_ms += self.accumulator - remainder - self.max_catch_up * self.step_ms
+            self.accumulator = remainder
+            return self.max_catch_up
+        self.accumulator -= steps * self.step_ms
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.step_ms
+
+    def reset(self):
+        self.accumulator = 0.0
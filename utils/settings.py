@@ -1,11 +1,9 @@
-import pygame
-
 # Screen settings
-pygame.init()
-info = pygame.display.Info()
 SCREEN_WIDTH = 800  # Fixed window size for consistent zoom
 SCREEN_HEIGHT = 600
 FPS = 60
+SIM_RATE = 60  # Simulation ticks per second, independent of FPS
+MAX_CATCH_UP_STEPS = 5  # Most ticks simulated in one frame; lag beyond that is dropped
 
 # Maze settings
 CELL_SIZE = 64  # Larger cells for better visibility
@@ -15,15 +13,61 @@ PLAYER_SIZE = 30
 MAZE_COLS = 30
 MAZE_ROWS = 30
 MAZE_COMPLEXITY = 0.7  # 0.1-1.0 (simple to complex)
+MAZE_ALGORITHM = 'prim'  # prim, backtracker, kruskal, wilson, eller
+TRAP_DENSITY = 0.05  # Fraction of cells that are traps
+MAZE_SEED = None  # Fixed seed to replay one layout; None picks a new one per run
+MAZE_CACHE_DIR = ".maze_cache"  # Layouts of fixed-seed games are kept here (None disables)
+MAZE_CACHE_MAX_FILES = 64  # Least recently used layouts beyond this are deleted
+LEVEL_PREFETCH = 2  # Upcoming levels built in the background (0 = build on demand)
+LEVEL_PREFETCH_PROCESSES = False  # Build them in a worker process instead of a thread
+
+# World settings
+WORLD_MODE = False  # One streaming world made of chunks instead of fixed-size levels
+WORLD_CHUNK_SIZE = 32  # Cells per chunk side (at most 256)
+WORLD_CHUNKS = 4096  # Chunks per world side; only those near the player are in memory
+WORLD_LOAD_RADIUS = 1  # Chunks kept loaded around the player's chunk
+WORLD_ENEMIES_PER_CHUNK = 1
+WORLD_EXIT_CHUNK = (4, 4)  # Chunk whose centre holds the exit
+WORLD_STORE_PATH = None  # File paged-out chunks go to (None = anonymous temp file)
 
 # Camera settings
 CAMERA_ZOOM = 0.8  # 0.5-1.0 (zoomed out to normal)
 CAMERA_SMOOTHNESS = 0.1  # Lower = smoother
 VISIBLE_RADIUS = 3  # Cells visible around player
+VISIBILITY_CACHE_SIZE = 1024  # Line-of-sight results kept (one per player cell and radius)
+
+# Rendering settings
+CHUNK_CACHE = True  # Blit pre-rendered blocks of explored cells
+DIRTY_RECTS = False  # Redraw and present only the screen regions that changed
+CHUNK_SIZE = 16  # Cells per chunk side
+CHUNK_CACHE_BUDGET = 48 * 1024 * 1024  # Bytes of cached chunk surfaces
+TEXT_CACHE_SIZE = 64  # Rendered text surfaces kept around
+ENEMY_ALPHA_STEP = 16  # Enemy sprite alpha is rounded to steps of this size
+
+# Asset settings
+SPRITE_DIR = "assets/sprites/character"  # Character sheets
+ASSET_CACHE_DIR = ".asset_cache"  # Scaled sprite sheets are kept here (None disables)
 
 # Lighting settings
 LIGHT_RADIUS = 150  # Pixels
 LIGHT_INTENSITY = 220  # 0-255
 FOG_COLOR = (10, 10, 15)  # Dark blue-gray
+AMBIENT_DARKNESS = 0  # 0-255; above 0 darkens the scene and lights cut through it
+GLOW_RADIUS = 90  # Pixels of light around found teleporters and the exit
+GLOW_INTENSITY = 180  # 0-255
+
+# Enemy settings
+ENEMY_COUNT = 5
+ENEMY_STORE_THRESHOLD = 64  # Enemy count from which the NumPy store is used (None = never)
+ENEMY_TRACKING_RANGE = 30  # Path steps within which enemies follow the maze to the player (None = whole maze)
+ENEMY_STEP_RATE = 60  # Cells per second an enemy can move (one per tick at the default SIM_RATE)
+ENEMY_DETECTION_RADIUS = None  # Cells (Manhattan) within which enemies notice the player; beyond it they wander (None = always chase)
+
+# Profiling settings
+PROFILER_ENABLED = False  # Time the hot paths from the start (F3 toggles it and the overlay)
+PROFILER_WINDOW = 300  # Samples kept per scope for the percentiles
+PROFILER_OVERLAY_REFRESH = 250  # ms between overlay redraws
+PROFILER_DUMP = "profile.json"  # F4 writes the current stats here (.csv or .json)
 
-PLAYER_SPEED = 3  # Slightly slower for better control
\ No newline at end of file
+PLAYER_SPEED = 3  # Slightly slower for better control
+BOT_SPEED = 120  # Pixels per second a Bot moves towards its target
\ No newline at end of file
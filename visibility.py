@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from wall_grid import WALL_BITS
+from utils.settings import VISIBILITY_CACHE_SIZE
+
+def clear_path(walls, rows, x0, y0, x1, y1):
+    """
+    True if a ray from the centre of cell (x0, y0) to the centre of (x1, y1)
+    crosses no wall. Walks the cells along the ray (grid traversal) and
+    checks the wall bit of every edge it crosses; a ray through a corner
+    gets through if either of the two cells beside the corner lets it.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    ax = abs(dx)
+    ay = abs(dy)
+    x_bit = WALL_BITS['right'] if dx > 0 else WALL_BITS['left']
+    y_bit = WALL_BITS['bottom'] if dy > 0 else WALL_BITS['top']
+    x_delta = rows if dx > 0 else -rows
+    y_delta = 1 if dy > 0 else -1
+
+    index = x0 * rows + y0
+    kx = ky = 0  # Vertical and horizontal grid lines crossed so far
+    while kx < ax or ky < ay:
+        # Crossing times scaled by 2*ax*ay so ties (corners) compare exactly
+        tx = (2 * kx + 1) * ay
+        ty = (2 * ky + 1) * ax
+        if ky >= ay or (kx < ax and tx < ty):
+            if walls[index] & x_bit:
+                return False
+            index += x_delta
+            kx += 1
+        elif kx >= ax or ty < tx:
+            if walls[index] & y_bit:
+                return False
+            index += y_delta
+            ky += 1
+        else:
+            via_x = not walls[index] & x_bit and not walls[index + x_delta] & y_bit
+            via_y = not walls[index] & y_bit and not walls[index + y_delta] & x_bit
+            if not (via_x or via_y):
+                return False
+            index += x_delta + y_delta
+            kx += 1
+            ky += 1
+    return True
+
+class Visibility:
+    """
+    Line of sight through the maze walls. visible() returns the packed
+    indices (x * rows + y) of the cells seen from a cell within a square of
+    `radius`, cached per (cell, radius) until the walls change.
+    """
+    def __init__(self, maze, max_entries=VISIBILITY_CACHE_SIZE):
+        self.maze = maze
+        self.max_entries = max_entries
+        self.cache = OrderedDict()  # (x, y, radius) -> frozenset of cell indices
+
+    def invalidate(self):
+        self.cache.clear()
+
+    def visible(self, x, y, radius):
+        key = (x, y, radius)
+        cells = self.cache.get(key)
+        if cells is not None:
+            self.cache.move_to_end(key)
+            return cells
+
+        cells = self.compute(x, y, radius)
+        self.cache[key] = cells
+        if len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+        return cells
+
+    def compute(self, x, y, radius):
+        maze = self.maze
+        rows = maze.rows
+        walls = maze.grid.walls
+        return frozenset(
+            tx * rows + ty
+            for tx in range(max(0, x - radius), min(maze.cols, x + radius + 1))
+            for ty in range(max(0, y - radius), min(rows, y + radius + 1))
+            if clear_path(walls, rows, x, y, tx, ty)
+        )
+
+    def can_see(self, x0, y0, x1, y1):
+        return clear_path(self.maze.grid.walls, self.maze.rows, x0, y0, x1, y1)
@@ -0,0 +1,214 @@
+from enum import Enum
+from generators import OFFSETS, OPPOSITE
+
+class CellType(Enum):
+    NORMAL = 0
+    TRAP = 1
+    TELEPORT = 2
+    BUTTON = 3
+    EXIT = 4
+
+CELL_TYPES = tuple(CellType)  # Indexed by the packed type byte
+
+# One bit per wall, four per cell
+WALL_BITS = {'top': 1, 'right': 2, 'bottom': 4, 'left': 8}
+DIRECTION_BITS = {(0, -1): 1, (1, 0): 2, (0, 1): 4, (-1, 0): 8}
+ALL_WALLS = 15
+
+# Bits of the per-cell flags byte
+VISIBLE = 1
+
+
+class WallsView:
+    """Dict-like view of one cell's wall bits ({'top': True, ...})"""
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, name):
+        return bool(self.grid.walls[self.index] & WALL_BITS[name])
+
+    def __setitem__(self, name, value):
+        if value:
+            self.grid.walls[self.index] |= WALL_BITS[name]
+        else:
+            self.grid.walls[self.index] &= ~WALL_BITS[name]
+
+    def __iter__(self):
+        return iter(WALL_BITS)
+
+    def __len__(self):
+        return len(WALL_BITS)
+
+    def keys(self):
+        return WALL_BITS.keys()
+
+    def items(self):
+        return [(name, self[name]) for name in WALL_BITS]
+
+    def __eq__(self, other):
+        return dict(self.items()) == dict(other.items())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class CellView:
+    """Thin Cell-like accessor over one slot of a WallGrid"""
+    __slots__ = ('grid', 'x', 'y', 'index')
+
+    def __init__(self, grid, x, y):
+        self.grid = grid
+        self.x = x
+        self.y = y
+        self.index = x * grid.rows + y
+
+    @property
+    def walls(self):
+        return WallsView(self.grid, self.index)
+
+    @walls.setter
+    def walls(self, walls):
+        mask = 0
+        for name, present in walls.items():
+            if present:
+                mask |= WALL_BITS[name]
+        self.grid.walls[self.index] = mask
+
+    @property
+    def type(self):
+        return CELL_TYPES[self.grid.types[self.index]]
+
+    @type.setter
+    def type(self, cell_type):
+        self.grid.types[self.index] = cell_type.value
+
+    @property
+    def triggered(self):
+        return bool(self.grid.triggered[self.index])
+
+    @triggered.setter
+    def triggered(self, value):
+        self.grid.triggered[self.index] = 1 if value else 0
+
+    @property
+    def visible(self):
+        return bool(self.grid.flags[self.index] & VISIBLE)
+
+    @visible.setter
+    def visible(self, value):
+        if value:
+            self.grid.flags[self.index] |= VISIBLE
+        else:
+            self.grid.flags[self.index] &= ~VISIBLE
+
+    @property
+    def linked_teleport(self):
+        return self.grid.teleports.get(self.index)
+
+    @linked_teleport.setter
+    def linked_teleport(self, target):
+        if target is None:
+            self.grid.teleports.pop(self.index, None)
+        else:
+            self.grid.teleports[self.index] = target
+
+
+class _Column:
+    __slots__ = ('grid', 'x')
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.x = x
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.rows:
+            raise IndexError(f"Row out of range: {y}")
+        return CellView(self.grid, self.x, y)
+
+    def __len__(self):
+        return self.grid.rows
+
+
+class WallGrid:
+    """
+    Packed maze storage: one byte of wall bits per cell plus parallel byte
+    arrays for cell type, trigger state and render flags. Cells are stored
+    column-major (index = x * rows + y) and grid[x][y] yields a CellView.
+    """
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        size = cols * rows
+        self.walls = bytearray([ALL_WALLS]) * size
+        self.types = bytearray(size)
+        self.triggered = bytearray(size)
+        self.flags = bytearray(size)
+        self.teleports = {}  # index -> linked (x, y); only a handful exist
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.cols:
+            raise IndexError(f"Column out of range: {x}")
+        return _Column(self, x)
+
+    def __len__(self):
+        return self.cols
+
+    def index(self, x, y):
+        return x * self.rows + y
+
+    def cell(self, x, y):
+        return CellView(self, x, y)
+
+    def wall_mask(self, x, y):
+        return self.walls[x * self.rows + y]
+
+    def remove_wall(self, x, y, name):
+        """Open the wall `name` of (x, y) and its twin on the neighbour"""
+        dx, dy = OFFSETS[name]
+        self.walls[x * self.rows + y] &= ~WALL_BITS[name]
+        self.walls[(x + dx) * self.rows + y + dy] &= ~WALL_BITS[OPPOSITE[name]]
+
+    def reset_walls(self):
+        self.walls[:] = bytearray([ALL_WALLS]) * len(self.walls)
+
+    def clear_triggers(self):
+        self.triggered[:] = bytearray(len(self.triggered))
+
+    def nbytes(self):
+        return len(self.walls) + len(self.types) + len(self.triggered) + len(self.flags)
+
+
+def memory_report(sizes=(60, 250, 500, 1000), sample=100):
+    """
+    Compare the footprint of a grid of Cell objects against a WallGrid.
+    The object grid is measured on a sample x sample grid and extrapolated
+    per cell so the large sizes don't need hundreds of MB to report.
+    """
+    import tracemalloc
+    from maze import Cell
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    grid = [[Cell(x, y) for y in range(sample)] for x in range(sample)]
+    per_cell = (tracemalloc.get_traced_memory()[0] - before) / (sample * sample)
+    del grid
+
+    rows = []
+    for size in sizes:
+        before = tracemalloc.get_traced_memory()[0]
+        packed = WallGrid(size, size)
+        packed_bytes = tracemalloc.get_traced_memory()[0] - before
+        del packed
+        rows.append((size, int(per_cell * size * size), packed_bytes))
+    tracemalloc.stop()
+    return rows
+
+
+if __name__ == "__main__":
+    print(f"{'grid':>11} {'Cell objects':>14} {'WallGrid':>12} {'saved':>8}")
+    for size, objects, packed in memory_report():
+        print(f"{size:>5}x{size:<5} {objects / 2**20:>11.1f} MB {packed / 2**20:>9.2f} MB "
+              f"{100 * (1 - packed / objects):>7.1f}%")
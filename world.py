@@ -0,0 +1,533 @@
+import mmap
+import random
+import tempfile
+from generators import carve_passages
+from wall_grid import WallGrid, CellType, WALL_BITS, DIRECTION_BITS, ALL_WALLS
+from enemy import Enemy
+from spatial_hash import SpatialHash
+from pathfinding import DistanceField, astar
+from visibility import Visibility, clear_path
+from maze import Maze
+from utils.settings import *
+
+MAX_RUN = 8  # Longest east-west run of linked chunks, so door lookups stay local
+MAX_STORED_ENEMIES = 32  # Enemy slots in a stored chunk record; the rest spill to memory
+
+def chunk_rng(seed, cx, cy, purpose=""):
+    """Random stream for one chunk, independent of the order chunks are visited in"""
+    return random.Random(f"{seed}:{cx}:{cy}:{purpose}")
+
+def seal(walls, cols, rows):
+    """Close the outer edge of a packed cols x rows block so searches can't walk off it"""
+    top, right, bottom, left = (WALL_BITS[name] for name in ('top', 'right', 'bottom', 'left'))
+    for i in range(rows):
+        walls[i] |= left
+        walls[(cols - 1) * rows + i] |= right
+    for x in range(cols):
+        walls[x * rows] |= top
+        walls[x * rows + rows - 1] |= bottom
+
+class ChunkStore:
+    """
+    Fixed-size chunk records in a memory-mapped file. Slots are handed out
+    as chunks are first evicted and the file doubles when it runs out.
+    """
+    def __init__(self, record_size, path=None, capacity=64):
+        self.record_size = record_size
+        self.file = open(path, "w+b") if path else tempfile.TemporaryFile()
+        self.slots = {}  # (cx, cy) -> slot
+        self.map = None
+        self.capacity = 0
+        self.grow(capacity)
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def grow(self, capacity):
+        if self.map:
+            self.map.close()
+        self.file.truncate(capacity * self.record_size)
+        self.map = mmap.mmap(self.file.fileno(), capacity * self.record_size)
+        self.capacity = capacity
+
+    def write(self, key, record):
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self.grow(self.capacity * 2)
+            self.slots[key] = slot
+        offset = slot * self.record_size
+        self.map[offset:offset + len(record)] = record
+
+    def read(self, key):
+        offset = self.slots[key] * self.record_size
+        return self.map[offset:offset + self.record_size]
+
+    def close(self):
+        if self.map:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+class WorldGrid:
+    """grid[x][y] over the world's chunks, yielding the chunk's CellView"""
+    def __init__(self, world):
+        self.world = world
+
+    def __getitem__(self, x):
+        return _WorldColumn(self.world, x)
+
+    def cell(self, x, y):
+        size = self.world.chunk_size
+        cx, lx = divmod(x, size)
+        cy, ly = divmod(y, size)
+        return self.world.chunk(cx, cy).cell(lx, ly)
+
+class _WorldColumn:
+    __slots__ = ('world', 'x')
+
+    def __init__(self, world, x):
+        self.world = world
+        self.x = x
+
+    def __getitem__(self, y):
+        return self.world.grid.cell(self.x, y)
+
+class _Window:
+    """Just enough of a Maze (cols, rows and the grid's byte layers) for DistanceField and astar"""
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.grid = WallGrid(0, 0)
+        self.grid.walls = bytearray([ALL_WALLS]) * (cols * rows)
+        self.grid.types = bytearray(cols * rows)
+        self.grid.triggered = bytearray(cols * rows)
+
+class WindowDistanceField:
+    """
+    DistanceField over a square window of the world centred on the source,
+    reach cells out, so it never needs the whole (unbounded) grid.
+    """
+    def __init__(self, world, reach):
+        self.world = world
+        self.reach = reach
+        self.side = 2 * reach + 1
+        self.view = _Window(self.side, self.side)
+        self.field = DistanceField(self.view, reach)
+        self.origin = (0, 0)
+        self.source = None
+
+    def update(self, source):
+        if source == self.source:
+            return
+        self.source = source
+        x0, y0 = source[0] - self.reach, source[1] - self.reach
+        self.origin = (x0, y0)
+        self.view.grid.walls = self.world.window(x0, y0, self.side, self.side)
+        self.field.invalidate()
+        self.field.update((self.reach, self.reach))
+
+    def invalidate(self):
+        self.source = None
+
+    def local(self, x, y):
+        lx, ly = x - self.origin[0], y - self.origin[1]
+        if self.source is None or not (0 <= lx < self.side and 0 <= ly < self.side):
+            return None
+        return lx, ly
+
+    def distance(self, x, y):
+        cell = self.local(x, y)
+        return self.field.distance(*cell) if cell else -1
+
+    def next_step(self, x, y):
+        cell = self.local(x, y)
+        return self.field.next_step(*cell) if cell else None
+
+class WorldVisibility(Visibility):
+    """Line of sight cast over a window copied out of the chunks around the viewer"""
+    def compute(self, x, y, radius):
+        world = self.maze
+        side = 2 * radius + 1
+        x0, y0 = x - radius, y - radius
+        walls = world.window(x0, y0, side, side)
+        rows = world.rows
+        return frozenset(
+            (x0 + tx) * rows + y0 + ty
+            for tx in range(max(0, -x0), min(side, world.cols - x0))
+            for ty in range(max(0, -y0), min(side, world.rows - y0))
+            if clear_path(walls, side, radius, radius, tx, ty)
+        )
+
+class World(Maze):
+    """
+    Streaming maze made of chunk_size x chunk_size chunks generated on
+    demand from per-chunk seeds. Chunks are linked by a sidewinder spanning
+    tree with one door per tree edge, so the whole world stays a perfect
+    maze whatever order chunks are built in. Chunks more than
+    WORLD_LOAD_RADIUS + 1 chunks from the player are written to a memory
+    mapped ChunkStore (with their triggers, fog and enemies) and dropped.
+
+    It is a drop-in Maze for the game: can_move, wall_mask, grid[x][y],
+    check_special_cells and update_enemies work in world cell coordinates.
+    """
+    def __init__(self, seed=None, clock=None, chunk_size=WORLD_CHUNK_SIZE, chunks=WORLD_CHUNKS,
+                 algorithm=None, trap_density=None, enemies_per_chunk=WORLD_ENEMIES_PER_CHUNK,
+                 load_radius=WORLD_LOAD_RADIUS, exit_chunk=WORLD_EXIT_CHUNK,
+                 store_path=WORLD_STORE_PATH):
+        if not 2 <= chunk_size <= 256:
+            raise ValueError("chunk_size must be between 2 and 256")
+        self.seed = random.randrange(2**32) if seed is None else seed
+        self.chunk_size = chunk_size
+        self.chunks_wide = chunks
+        self.cols = self.rows = chunk_size * chunks
+        self.algorithm = algorithm or MAZE_ALGORITHM
+        self._clock = clock
+        self.trap_density = TRAP_DENSITY if trap_density is None else trap_density
+        self.enemies_per_chunk = enemies_per_chunk
+        self.load_radius = load_radius
+        self.rng = random.Random(f"{self.seed}:play")
+
+        self.start_pos = (0, 0)
+        exit_cx, exit_cy = (min(c, chunks - 1) for c in exit_chunk)
+        self.exit_pos = (exit_cx * chunk_size + chunk_size // 2, exit_cy * chunk_size + chunk_size // 2)
+
+        size = chunk_size * chunk_size
+        self.store = ChunkStore(4 * size + 1 + 2 * MAX_STORED_ENEMIES, store_path)
+        self.chunks = {}  # (cx, cy) -> WallGrid of the resident chunks
+        self.spilled = {}  # (cx, cy) -> world cells of enemies that didn't fit the chunk's record
+        self.player_chunk = None
+        self.fog = None  # SparseFog paged with the chunks, set by the game
+        self.grid = WorldGrid(self)
+        self.enemies = []
+        self.enemy_store = None
+        self.enemy_index = SpatialHash()
+        self.visible_enemies = []
+
+        self.reset_time = 0
+        self.reset_cooldown = 10000  # ms before maze can reset again
+        self.enemy_step_ms = 1000 / ENEMY_STEP_RATE
+        self.enemy_time = 0.0
+        self.chunk_cache_enabled = False
+        self.tile_cache = None
+        self._renderer = None
+        self.distance_field = WindowDistanceField(self, ENEMY_TRACKING_RANGE or 30)
+        self.visibility = WorldVisibility(self)
+        self.stream(*self.start_pos)
+
+    # Chunk-level spanning tree
+    def links_east(self, cx, cy):
+        """Whether chunk (cx, cy) has a door into (cx + 1, cy)"""
+        if cx < 0 or cx + 1 >= self.chunks_wide:
+            return False
+        if cy == 0:
+            return True  # Top row is one long run
+        if (cx + 1) % MAX_RUN == 0:
+            return False
+        return chunk_rng(self.seed, cx, cy, "east").random() < 0.5
+
+    def links_north(self, cx, cy):
+        """Whether chunk (cx, cy) has a door into (cx, cy - 1): one per east-west run"""
+        if cy <= 0 or cy >= self.chunks_wide:
+            return False
+        return self.north_door(cx, cy) == cx
+
+    def north_door(self, cx, cy):
+        """x of the chunk in (cx, cy)'s east-west run that links north"""
+        start = cx
+        while self.links_east(start - 1, cy):
+            start -= 1
+        end = cx
+        while self.links_east(end, cy):
+            end += 1
+        return start + chunk_rng(self.seed, start, cy, "north").randrange(end - start + 1)
+
+    def parent(self, cx, cy):
+        """Next chunk on the way to chunk (0, 0), the root of the chunk tree"""
+        if cy == 0:
+            return cx - 1, 0  # The top row is one run linked all the way west
+        door = self.north_door(cx, cy)
+        if door == cx:
+            return cx, cy - 1
+        return (cx + 1 if door > cx else cx - 1), cy
+
+    def chunk_route(self, a, b):
+        """Chunks on the only route from chunk a to chunk b, both included"""
+        up = [a]
+        while up[-1] != (0, 0):
+            up.append(self.parent(*up[-1]))
+        depth = {chunk: i for i, chunk in enumerate(up)}
+        down = [b]
+        while down[-1] not in depth:
+            down.append(self.parent(*down[-1]))
+        return up[:depth[down[-1]] + 1] + down[-2::-1]
+
+    def doors(self, cx, cy):
+        """(local x, local y, wall bit) of every door in the border of chunk (cx, cy)"""
+        last = self.chunk_size - 1
+        doors = []
+        if self.links_east(cx, cy):
+            doors.append((last, chunk_rng(self.seed, cx, cy, "door-east").randrange(last + 1), WALL_BITS['right']))
+        if self.links_east(cx - 1, cy):
+            doors.append((0, chunk_rng(self.seed, cx - 1, cy, "door-east").randrange(last + 1), WALL_BITS['left']))
+        if self.links_north(cx, cy):
+            doors.append((chunk_rng(self.seed, cx, cy, "door-north").randrange(last + 1), 0, WALL_BITS['top']))
+        if self.links_north(cx, cy + 1):
+            doors.append((chunk_rng(self.seed, cx, cy + 1, "door-north").randrange(last + 1), last, WALL_BITS['bottom']))
+        return doors
+
+    # Chunk residency
+    def chunk(self, cx, cy):
+        grid = self.chunks.get((cx, cy))
+        if grid is None:
+            grid = self.load_chunk(cx, cy)
+        return grid
+
+    def peek(self, cx, cy):
+        """Grid of chunk (cx, cy) without loading it (or its enemies) into the world"""
+        grid = self.chunks.get((cx, cy))
+        if grid is not None:
+            return grid
+        if (cx, cy) in self.store:
+            return self.unpack(cx, cy, self.store.read((cx, cy)))[0]
+        return self.generate_chunk(cx, cy)[0]
+
+    def load_chunk(self, cx, cy):
+        key = (cx, cy)
+        if key in self.store:
+            grid, explored, positions = self.unpack(cx, cy, self.store.read(key))
+            positions.extend(self.spilled.pop(key, ()))
+            if self.fog:
+                self.fog.load_chunk(key, explored)
+        else:
+            grid, positions = self.generate_chunk(cx, cy)
+        self.chunks[key] = grid
+        for x, y in positions:
+            enemy = Enemy(x, y)
+            self.enemies.append(enemy)
+            self.enemy_index.insert(enemy)
+        return grid
+
+    def carve_chunk(self, grid, cx, cy, rng):
+        size = self.chunk_size
+        start = (rng.randrange(size), rng.randrange(size))
+        for x, y, wall in carve_passages(size, size, start, self.algorithm, rng):
+            grid.remove_wall(x, y, wall)
+        for x, y, bit in self.doors(cx, cy):
+            grid.walls[x * size + y] &= ~bit
+
+    def generate_chunk(self, cx, cy):
+        size = self.chunk_size
+        rng = chunk_rng(self.seed, cx, cy)
+        grid = WallGrid(size, size)
+        self.carve_chunk(grid, cx, cy, rng)
+
+        origin_x, origin_y = cx * size, cy * size
+        reserved = {(x - origin_x, y - origin_y) for x, y in (self.start_pos, self.exit_pos)}
+        if (self.exit_pos[0] // size, self.exit_pos[1] // size) == (cx, cy):
+            ex, ey = self.exit_pos[0] - origin_x, self.exit_pos[1] - origin_y
+            grid.types[ex * size + ey] = CellType.EXIT.value
+
+        def is_free(x, y):
+            return (x, y) not in reserved and grid.types[x * size + y] == CellType.NORMAL.value
+
+        def free_cell():
+            """A random normal cell, or None once the chunk has none left"""
+            for _ in range(4 * size * size):
+                x, y = rng.randrange(size), rng.randrange(size)
+                if is_free(x, y):
+                    return x, y
+            # Nearly full (small chunk or high trap density): pick from what's left
+            cells = [(x, y) for x in range(size) for y in range(size) if is_free(x, y)]
+            return rng.choice(cells) if cells else None
+
+        for _ in range(int(size * size * self.trap_density)):
+            cell = free_cell()
+            if cell is None:
+                break
+            grid.types[cell[0] * size + cell[1]] = CellType.TRAP.value
+        for cell_type in (CellType.TELEPORT, CellType.TELEPORT, CellType.BUTTON):
+            cell = free_cell()
+            if cell is None:
+                break
+            grid.types[cell[0] * size + cell[1]] = cell_type.value
+        self.link_teleports(grid, cx, cy)
+
+        positions = []
+        for _ in range(self.enemies_per_chunk):
+            x, y = rng.randrange(size) + origin_x, rng.randrange(size) + origin_y
+            # Keep enemies away from the start, like Maze does
+            if abs(x - self.start_pos[0]) + abs(y - self.start_pos[1]) > 10:
+                positions.append((x, y))
+        return grid, positions
+
+    def link_teleports(self, grid, cx, cy):
+        """Pair the chunk's teleporters in index order (world coordinates)"""
+        size = self.chunk_size
+        pads = [i for i, t in enumerate(grid.types) if t == CellType.TELEPORT.value]
+        grid.teleports.clear()
+        for a, b in zip(pads[::2], pads[1::2]):
+            ax, ay = divmod(a, size)
+            bx, by = divmod(b, size)
+            grid.teleports[a] = (cx * size + bx, cy * size + by)
+            grid.teleports[b] = (cx * size + ax, cy * size + ay)
+
+    def pack(self, cx, cy, grid, enemies, explored=None):
+        size = self.chunk_size
+        positions = bytearray()
+        for enemy in enemies[:MAX_STORED_ENEMIES]:
+            positions += bytes((enemy.x - cx * size, enemy.y - cy * size))
+        return b"".join((bytes(grid.walls), bytes(grid.types), bytes(grid.triggered),
+                         bytes(explored or bytearray(size * size)),
+                         bytes((min(len(enemies), MAX_STORED_ENEMIES),)), bytes(positions)))
+
+    def unpack(self, cx, cy, record):
+        size = self.chunk_size
+        area = size * size
+        grid = WallGrid(size, size)
+        grid.walls[:] = record[:area]
+        grid.types[:] = record[area:2 * area]
+        grid.triggered[:] = record[2 * area:3 * area]
+        self.link_teleports(grid, cx, cy)
+        explored = record[3 * area:4 * area]
+        count = record[4 * area]
+        offset = 4 * area + 1
+        positions = [(cx * size + record[offset + 2 * i], cy * size + record[offset + 2 * i + 1])
+                     for i in range(count)]
+        return grid, explored, positions
+
+    def evict(self, key):
+        """Write a chunk (walls, triggers, fog and the enemies inside it) to the store and drop it"""
+        size = self.chunk_size
+        grid = self.chunks.pop(key)
+        inside = [enemy for enemy in self.enemies if (enemy.x // size, enemy.y // size) == key]
+        for enemy in inside:
+            self.enemy_index.remove(enemy)
+        if inside:
+            gone = set(inside)
+            self.enemies = [enemy for enemy in self.enemies if enemy not in gone]
+            self.visible_enemies = [enemy for enemy in self.visible_enemies if enemy not in gone]
+        explored = self.fog.evict_chunk(key) if self.fog else None
+        self.store.write(key, self.pack(key[0], key[1], grid, inside, explored))
+        if len(inside) > MAX_STORED_ENEMIES:
+            self.spilled[key] = [(enemy.x, enemy.y) for enemy in inside[MAX_STORED_ENEMIES:]]
+
+    def stream(self, x, y):
+        """Load the chunks around cell (x, y) and evict the ones that fell out of range"""
+        size = self.chunk_size
+        cx, cy = x // size, y // size
+        if (cx, cy) == self.player_chunk:
+            return
+        self.player_chunk = (cx, cy)
+        radius = self.load_radius
+        for kx in range(max(0, cx - radius), min(self.chunks_wide, cx + radius + 1)):
+            for ky in range(max(0, cy - radius), min(self.chunks_wide, cy + radius + 1)):
+                self.chunk(kx, ky)
+        # One chunk of slack so walking along a border doesn't thrash
+        for key in [key for key in self.chunks
+                    if max(abs(key[0] - cx), abs(key[1] - cy)) > radius + 1]:
+            self.evict(key)
+
+    def window(self, x0, y0, cols, rows):
+        """
+        Walls of the cols x rows block at (x0, y0) as a packed column-major
+        bytearray; cells outside the world are solid and the block's own
+        edge is sealed so searches inside it can't walk off.
+        """
+        size = self.chunk_size
+        walls = bytearray([ALL_WALLS]) * (cols * rows)
+        y_start, y_end = max(0, y0), min(self.rows, y0 + rows)
+        for x in range(max(0, x0), min(self.cols, x0 + cols)):
+            cx, lx = divmod(x, size)
+            y = y_start
+            while y < y_end:
+                cy, ly = divmod(y, size)
+                count = min(size - ly, y_end - y)
+                source = lx * size + ly
+                target = (x - x0) * rows + (y - y0)
+                walls[target:target + count] = self.chunk(cx, cy).walls[source:source + count]
+                y += count
+        seal(walls, cols, rows)
+        return walls
+
+    def find_path(self, start, goal, trap_cost=0):
+        """
+        astar between two world cells. The chunk tree fixes which chunks the
+        route crosses, so only those are searched, over a window of their
+        bounding box with every other chunk left solid.
+        """
+        size = self.chunk_size
+        route = self.chunk_route((start[0] // size, start[1] // size), (goal[0] // size, goal[1] // size))
+        cx0 = min(cx for cx, _ in route)
+        cy0 = min(cy for _, cy in route)
+        view = _Window((max(cx for cx, _ in route) - cx0 + 1) * size,
+                       (max(cy for _, cy in route) - cy0 + 1) * size)
+        rows = view.rows
+        for cx, cy in route:
+            grid = self.peek(cx, cy)
+            for lx in range(size):
+                target = ((cx - cx0) * size + lx) * rows + (cy - cy0) * size
+                source = lx * size
+                view.grid.walls[target:target + size] = grid.walls[source:source + size]
+                view.grid.types[target:target + size] = grid.types[source:source + size]
+                view.grid.triggered[target:target + size] = grid.triggered[source:source + size]
+        seal(view.grid.walls, view.cols, rows)
+
+        x0, y0 = cx0 * size, cy0 * size
+        path = astar(view, (start[0] - x0, start[1] - y0), (goal[0] - x0, goal[1] - y0), trap_cost)
+        return [(x + x0, y + y0) for x, y in path] if path else None
+
+    # Maze interface
+    def can_move(self, x, y, direction):
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return False
+        bit = DIRECTION_BITS.get(direction)
+        if bit is None or self.wall_mask(x, y) & bit:
+            return False
+        # Enemies stay inside the loaded area rather than paging chunks in
+        size = self.chunk_size
+        return ((x + direction[0]) // size, (y + direction[1]) // size) in self.chunks
+
+    def wall_mask(self, x, y):
+        size = self.chunk_size
+        cx, lx = divmod(x, size)
+        cy, ly = divmod(y, size)
+        return self.chunk(cx, cy).walls[lx * size + ly]
+
+    def reset_maze(self):
+        """Re-carve every resident chunk; doors stay put so the world stays perfect"""
+        for (cx, cy), grid in self.chunks.items():
+            grid.reset_walls()
+            self.carve_chunk(grid, cx, cy, self.rng)
+            grid.clear_triggers()
+        self.distance_field.invalidate()
+        self.visibility.invalidate()
+
+    def update_enemies(self, player_pos, player_direction, player_light_on, dt=None):
+        self.stream(player_pos[0] // CELL_SIZE, player_pos[1] // CELL_SIZE)
+        super().update_enemies(player_pos, player_direction, player_light_on, dt)
+
+    def draw(self, screen, camera, fog, player_direction, player_pos):
+        renderer = self.renderer
+        x0, x1, y0, y1 = camera.visible_cell_range(self.cols, self.rows)
+        for x in range(x0, x1):
+            for y in range(y0, y1):
+                if fog.is_explored(x, y):
+                    renderer.draw_cell(screen, camera, x, y)
+        renderer.draw_enemies(screen, camera, player_direction, player_pos)
+
+    def light_sources(self, fog):
+        cells = [self.exit_pos]
+        for grid in self.chunks.values():
+            cells.extend(grid.teleports.values())
+        return [
+            ((x * CELL_SIZE + CELL_SIZE//2, y * CELL_SIZE + CELL_SIZE//2), GLOW_RADIUS, GLOW_INTENSITY)
+            for x, y in cells if fog.is_explored(x, y)
+        ]
+
+    def close(self):
+        self.store.close()